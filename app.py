@@ -1,107 +1,190 @@
-import json
 import streamlit as st
 import requests
-import pandas as pd
-from streamlit_folium import st_folium
-import folium
 
 API = "http://127.0.0.1:8000"
 
+
+@st.cache_resource
+def http() -> requests.Session:
+    """Keep-alive session shared across reruns, so calls reuse connections"""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=8)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def load_places(api: str) -> list:
+    """Saved places from the backend; reused across reruns for 30s"""
+    r = http().get(f"{api}/places", timeout=(2, 5))  # (connect, read)
+    r.raise_for_status()
+    return r.json()
+
+
+# Emoji icons by category
+ICON_MAP = {
+    "Cafe": "☕️",
+    "Food": "🍽️",
+    "Bar": "🍸",
+    "Activity": "🎯",
+    "Shop": "🛍️",
+    "Other": "📍"
+}
+
+# Above this many pins the map switches to client-side clustering
+CLUSTER_THRESHOLD = 2000
+
+# Above this many pins the map is only rendered once "Show map" is toggled on
+MAP_AUTOSHOW_LIMIT = 1000
+
+# FastMarkerCluster row -> marker; rows are [lat, lng, label]
+CLUSTER_MARKER_JS = """
+function (row) {
+    var marker = L.circleMarker(new L.LatLng(row[0], row[1]), {radius: 7, color: "#4DA3FF", fill: true, fillOpacity: 0.9});
+    marker.bindTooltip(row[2]);
+    return marker;
+}
+"""
+
+
+@st.cache_resource(show_spinner=False)
+def build_map(map_key: tuple) -> "folium.Map":
+    """Folium map with a marker per place; map_key holds
+    (name, lat, lng, category, district, source) tuples"""
+    import folium
+
+    # Create the map; canvas renderer draws all pins in one layer
+    m = folium.Map(location=[22.279, 114.162], zoom_start=13, prefer_canvas=True)
+
+    if len(map_key) > CLUSTER_THRESHOLD:
+        # Past a few thousand pins even one canvas layer is too dense; ship
+        # the coordinates as a JSON array and let Leaflet.markercluster build
+        # markers client-side
+        from folium.plugins import FastMarkerCluster
+
+        FastMarkerCluster(
+            [[lat, lng, f"{ICON_MAP.get(category, '📍')} {name}"] for name, lat, lng, category, _, _ in map_key],
+            callback=CLUSTER_MARKER_JS,
+        ).add_to(m)
+    else:
+        # One GeoJSON layer of canvas circle markers instead of a DivIcon
+        # DOM node per place
+        features = [
+            {
+                "type": "Feature",
+                "geometry": {"type": "Point", "coordinates": [lng, lat]},
+                "properties": {
+                    "emoji": ICON_MAP.get(category, "📍"),
+                    "name": name,
+                    "district": district or "",
+                    "category": category,
+                    "source": source or "",
+                },
+            }
+            for name, lat, lng, category, district, source in map_key
+        ]
+        folium.GeoJson(
+            {"type": "FeatureCollection", "features": features},
+            marker=folium.CircleMarker(radius=7, color="#4DA3FF", fill=True, fill_opacity=0.9),
+            tooltip=folium.GeoJsonTooltip(fields=["emoji", "name"], labels=False),
+            popup=folium.GeoJsonPopup(fields=["name", "district", "category", "source"], labels=False),
+        ).add_to(m)
+
+    # Open framed on the pins rather than a fixed Central viewport
+    lats = [lat for _, lat, _, _, _, _ in map_key]
+    lngs = [lng for _, _, lng, _, _, _ in map_key]
+    m.fit_bounds([[min(lats), min(lngs)], [max(lats), max(lngs)]], max_zoom=16)
+
+    return m
+
+
 st.set_page_config(page_title="Radar Demo", layout="centered")
 st.title("🎯 Radar Demo")
 
 # Keep candidate result between reruns
-if "candidate" not in st.session_state:
-    st.session_state["candidate"] = {}
-if "name_to_save" not in st.session_state:
-    st.session_state["name_to_save"] = ""
-if "selected_suggestion" not in st.session_state:
-    st.session_state["selected_suggestion"] = None
+SESSION_DEFAULTS = {
+    "candidate": {},
+    "name_to_save": "",
+    "selected_suggestion": None,
+}
+for key, value in SESSION_DEFAULTS.items():
+    st.session_state.setdefault(key, value)
 
 tab_map, tab_add, tab_import = st.tabs(["🗺️ Map", "➕ Add Place", "🔗 Import from Link"])
 
 # -----------------------------
-# MAP TAB (with emoji markers only)
+# MAP TAB
 # -----------------------------
-with tab_map:
+@st.fragment
+def render_map_tab():
+    """Map tab; runs as a fragment so its own reruns skip the other tabs"""
     st.subheader("Your Saved Places")
 
-    # Load from backend
+    # Load from backend; if it's down, keep showing the last good result
     try:
-        r = requests.get(f"{API}/places")
-        r.raise_for_status()
-        data = r.json()
+        data = load_places(API)
+        st.session_state["last_places"] = data
     except Exception as e:
-        st.error(f"Failed to load places: {e}")
-        data = []
+        data = st.session_state.get("last_places")
+        if data is None:
+            st.error(f"Failed to load places: {e}")
+            data = []
+        else:
+            st.warning(f"Backend unavailable, showing last loaded places: {e}")
 
     if not data:
         st.info("No places yet. Import some from Instagram or add manually!")
-    else:
-        df = pd.DataFrame(data)
-
-        # Emoji icons by category
-        icon_map = {
-            "Cafe": "☕️",
-            "Food": "🍽️",
-            "Bar": "🍸",
-            "Activity": "🎯",
-            "Shop": "🛍️",
-            "Other": "📍"
-        }
-
-        # Create the map
-        m = folium.Map(location=[22.279, 114.162], zoom_start=13)
-
-        # Add emoji markers (visible icons) - FIXED INDENTATION
-        for _, row in df.iterrows():
-            emoji = icon_map.get(row.get("category", "Other"), "📍")
-            html_icon = folium.DivIcon(
-                html=f"""
-                <div style='font-size:24px; text-align:center; transform: translate(-12px, -12px);'>
-                    {emoji}
-                </div>
-                """
-            )
-            folium.Marker(
-                [row.lat, row.lng],
-                tooltip=f"{row.name}",
-                popup=f"""
-                    <b>{row.name}</b><br>
-                    {row.district or ''}<br>
-                    {row.category}<br>
-                    <a href='{row.source}' target='_blank' style='color:#4DA3FF;text-decoration:none;'>Open post ↗️</a>
-                """,
-                icon=html_icon
-            ).add_to(m)
-
-        st_folium(m, width=720, height=480)
-        
-        # Show list of places
-        st.markdown("---")
-        st.markdown("### Saved Places")
-        for idx, row in df.iterrows():
-            col1, col2, col3 = st.columns([3, 2, 1])
-            with col1:
-                st.markdown(f"**{row['name']}**")
-            with col2:
-                st.caption(f"{row.get('district', '—')} • {row.get('category', 'Other')}")
-            with col3:
-                if row.get('source') and row['source'] != 'manual':
-                    st.markdown(f"[🔗]({row['source']})")
+        return
+
+    # Large maps are opt-in; the toggle's key keeps the choice across reruns
+    if len(data) <= MAP_AUTOSHOW_LIMIT or st.toggle("Show map", key="show_map"):
+        from streamlit_folium import st_folium
+
+        # Map is only rebuilt when the set of pins changes
+        map_key = tuple(
+            (d["name"], d["lat"], d["lng"], d.get("category", "Other"), d.get("district"), d.get("source"))
+            for d in data
+        )
+        m = build_map(map_key)
+
+        # Display only: returned_objects=[] keeps pan/zoom client-side in
+        # Leaflet instead of sending each gesture back as a rerun
+        st_folium(m, width=720, height=480, returned_objects=[])
+    
+    # Show list of places
+    st.markdown("---")
+    st.markdown("### Saved Places")
+    for row in data:
+        col1, col2, col3 = st.columns([3, 2, 1])
+        with col1:
+            st.markdown(f"**{row['name']}**")
+        with col2:
+            st.caption(f"{row.get('district', '—')} • {row.get('category', 'Other')}")
+        with col3:
+            if row.get('source') and row['source'] != 'manual':
+                st.markdown(f"[🔗]({row['source']})")
+
+
+with tab_map:
+    render_map_tab()
 
 # -----------------------------
 # ADD PLACE TAB (manual)
 # -----------------------------
 with tab_add:
     st.subheader("Add a place manually")
-    name = st.text_input("Place Name")
-    district = st.text_input("District", "Central")
-    category = st.selectbox("Category", ["Cafe", "Food", "Bar", "Activity", "Shop", "Other"])
-    lat = st.number_input("Latitude", value=22.279, format="%.6f")
-    lng = st.number_input("Longitude", value=114.162, format="%.6f")
 
-    if st.button("💾 Save Place"):
+    # Inputs only rerun the script once, on submit
+    with st.form("add_place"):
+        name = st.text_input("Place Name")
+        district = st.text_input("District", "Central")
+        category = st.selectbox("Category", ["Cafe", "Food", "Bar", "Activity", "Shop", "Other"])
+        lat = st.number_input("Latitude", value=22.279, format="%.6f")
+        lng = st.number_input("Longitude", value=114.162, format="%.6f")
+        submitted = st.form_submit_button("💾 Save Place")
+
+    if submitted:
         if not name or not name.strip():
             st.error("Please enter a place name!")
         else:
@@ -115,8 +198,9 @@ with tab_add:
                 "source": "manual",
             }
             try:
-                resp = requests.post(f"{API}/places", json=payload, timeout=15)
+                resp = http().post(f"{API}/places", json=payload, timeout=15)
                 if resp.ok:
+                    load_places.clear()
                     st.success("✅ Saved! Check the Map tab.")
                     st.balloons()
                 else:
@@ -148,7 +232,7 @@ with tab_import:
             
         with st.spinner("Extracting place information..."):
             try:
-                resp = requests.post(f"{API}/import-url", json={"url": url.strip()}, timeout=20)
+                resp = http().post(f"{API}/import-url", json={"url": url.strip()}, timeout=20)
                 resp.raise_for_status()
                 data = resp.json()
             except Exception as e:
@@ -187,7 +271,7 @@ with tab_import:
 
         # Show raw response in expander
         with st.expander("🔍 View Raw API Response"):
-            st.json(data)
+            st.json(data, expanded=False)
 
         # --- MANUAL FALLBACK UI ---
         if needs_review and suggestions:
@@ -256,8 +340,9 @@ with tab_import:
                     "source": url.strip(),
                 }
                 try:
-                    r2 = requests.post(f"{API}/places", json=payload, timeout=15)
+                    r2 = http().post(f"{API}/places", json=payload, timeout=15)
                     if r2.ok:
+                        load_places.clear()
                         st.success("✅ Saved! Go to the Map tab to see your pin.")
                         st.balloons()
                         # Clear state
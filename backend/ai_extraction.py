@@ -7,39 +7,75 @@ import os
 import logging
 import json
 from typing import Optional, Dict, List
-import httpx
-from openai import AzureOpenAI
+from cachetools import TTLCache
+from http_client import get_http_client
+from openai import AsyncAzureOpenAI
 import re
+from urllib.parse import urlparse
 from ai_extraction_helpers import extract_district
 
 logger = logging.getLogger(__name__)
 
 # Azure OpenAI Configuration
-client = AzureOpenAI(
+client = AsyncAzureOpenAI(
     api_key=os.getenv("AZURE_OPENAI_KEY"),
     api_version="2024-10-21",
     azure_endpoint="https://hkust.azure-api.net"
 )
 logger.info("✅ Azure OpenAI client initialized")
 
+# Place name after 📍, stopping before common descriptive words, @mentions,
+# #hashtags, Chinese text, or newlines. Includes English, numbers, Vietnamese
+# (Latin Extended) and common punctuation (&, ', -)
+_PIN_RE = re.compile(r'📍\s*([a-zA-Z0-9\u00C0-\u024F\u1E00-\u1EFF\s,\.\-&\']+?)(?=\s+(?:captured|at|in|with|for|and|the|is|was|has|had|have|their|this|that|my|our|your)\b|\s+[@#]|\s+[\u4e00-\u9fff]|\n|$)')
+_TRAILING_PUNCT_RE = re.compile(r'[\s,;:.!?-]+$')
+_AI_PLACE_RE = re.compile(r'Place:\s*(.+)')
+_AI_DISTRICT_RE = re.compile(r'District:\s*(.+)')
+_AI_CATEGORY_RE = re.compile(r'Category:\s*(.+)')
+
+# source_platform by URL host - one urlparse + dict lookup, anchored to the host
+_PLATFORM_HOSTS = {
+    "instagram.com": "instagram",
+    "instagr.am": "instagram",
+    "xiaohongshu.com": "xiaohongshu",
+    "xhslink.com": "xiaohongshu",
+    "tiktok.com": "tiktok",
+    "vm.tiktok.com": "tiktok",
+}
+
+# Microlink metadata keyed by post URL - a post's caption rarely changes
+_metadata_cache = TTLCache(maxsize=10_000, ttl=60 * 60 * 24)
+
+
+def detect_platform(url: str) -> str:
+    """Map a post URL to its source_platform, "web" for unknown hosts"""
+    host = (urlparse(url).hostname or "").removeprefix("www.").removeprefix("m.")
+    return _PLATFORM_HOSTS.get(host, "web")
+
 
 async def fetch_instagram_metadata(url: str) -> Optional[Dict]:
     """
     Fetch Instagram post metadata using Microlink API
     Returns caption, images, and any geo data
     """
+    cached = _metadata_cache.get(url)
+    if cached is not None:
+        logger.info(f"📥 Metadata cache hit for: {url}")
+        return cached
+    
     try:
-        async with httpx.AsyncClient(timeout=15.0) as http_client:
-            response = await http_client.get(
-                "https://api.microlink.io",
-                params={
-                    "url": url,
-                    "screenshot": "false",
-                    "meta": "true",
-                }
-            )
-            response.raise_for_status()
-            data = response.json()
+        http_client = get_http_client()
+        response = await http_client.get(
+            "https://api.microlink.io",
+            timeout=15.0,
+            params={
+                "url": url,
+                "screenshot": "false",
+                "meta": "true",
+            }
+        )
+        response.raise_for_status()
+        data = response.json()
         
         if data.get("status") != "success":
             logger.warning(f"⚠️ Microlink API error: {data.get('status')}")
@@ -47,19 +83,21 @@ async def fetch_instagram_metadata(url: str) -> Optional[Dict]:
         
         metadata = data.get("data", {})
         
-        return {
+        result = {
             "title": metadata.get("title"),
             "description": metadata.get("description"),
             "image": metadata.get("image", {}).get("url"),
             "url": url,
         }
+        _metadata_cache[url] = result
+        return result
     
     except Exception as e:
         logger.error(f"❌ Error fetching Instagram metadata: {e}")
         return None
 
 
-def extract_place_from_caption(caption: str, url: str = None) -> Optional[Dict]:
+async def extract_place_from_caption(caption: str, url: str = None) -> Optional[Dict]:
     """
     Extract place information from Instagram caption.
     
@@ -69,15 +107,12 @@ def extract_place_from_caption(caption: str, url: str = None) -> Optional[Dict]:
     3. Return structured data
     """
     # Method 1: Check for 📍 pin emoji
-    # Match place name after 📍, stop before common descriptive words, @mentions, #hashtags, Chinese text, or newlines
-    # Includes: English, numbers, Vietnamese (Latin Extended), common punctuation (&, ', -)
-    pin_pattern = r'📍\s*([a-zA-Z0-9\u00C0-\u024F\u1E00-\u1EFF\s,\.\-&\']+?)(?=\s+(?:captured|at|in|with|for|and|the|is|was|has|had|have|their|this|that|my|our|your)\b|\s+[@#]|\s+[\u4e00-\u9fff]|\n|$)'
-    pin_match = re.search(pin_pattern, caption)
+    pin_match = _PIN_RE.search(caption)
     
     if pin_match:
         place_name = pin_match.group(1).strip()
         # Clean up trailing punctuation and whitespace
-        place_name = re.sub(r'[\s,;:.!?-]+$', '', place_name)
+        place_name = _TRAILING_PUNCT_RE.sub('', place_name)
         place_name = place_name.strip()
         logger.info(f"✅ Found pin emoji: {place_name}")
         
@@ -110,7 +145,7 @@ Category: [eat/cafes/bars/shops/leisure/go_out/nature/culture]
 """
 
     try:
-        response = client.chat.completions.create(
+        response = await client.chat.completions.create(
             model="gpt-4.1-mini",
             messages=[
                 {"role": "system", "content": "You are a helpful assistant that extracts structured data from text. Always respond with valid JSON only."},
@@ -123,9 +158,9 @@ Category: [eat/cafes/bars/shops/leisure/go_out/nature/culture]
         result_text = response.choices[0].message.content.strip()
         
         # Parse response
-        place_match = re.search(r'Place:\s*(.+)', result_text)
-        district_match = re.search(r'District:\s*(.+)', result_text)
-        category_match = re.search(r'Category:\s*(.+)', result_text)
+        place_match = _AI_PLACE_RE.search(result_text)
+        district_match = _AI_DISTRICT_RE.search(result_text)
+        category_match = _AI_CATEGORY_RE.search(result_text)
         
         place_name = place_match.group(1).strip() if place_match else None
         district = district_match.group(1).strip() if district_match else None
@@ -172,14 +207,14 @@ async def process_instagram_url(url: str) -> Optional[Dict]:
         logger.warning("⚠️ No caption found in post")
         return None
     
-    # FIXED: Removed 'await' since extract_place_from_caption is NOT async
-    place_info = extract_place_from_caption(caption, url)
+    # Async so the OpenAI call doesn't block the event loop
+    place_info = await extract_place_from_caption(caption, url)
     if not place_info:
         return None
     
     # Add source metadata
     place_info["source_url"] = url
-    place_info["source_platform"] = "instagram"
+    place_info["source_platform"] = detect_platform(url)
     place_info["source_caption"] = caption
     place_info["source_image"] = metadata.get("image")
     
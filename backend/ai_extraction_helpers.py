@@ -4,27 +4,30 @@ Helper functions for AI extraction
 
 import re
 
+HK_DISTRICTS = [
+    "Central", "Sheung Wan", "Wan Chai", "Causeway Bay", "Admiralty",
+    "Tsim Sha Tsui", "TST", "Mong Kok", "Jordan", "Yau Ma Tei",
+    "Sai Kung", "Stanley", "Repulse Bay", "Aberdeen", "Kennedy Town",
+    "Sham Shui Po", "Kwun Tong", "Tai Hang", "Tin Hau", "Fortress Hill",
+    "North Point", "Quarry Bay", "Tai Koo", "Shau Kei Wan",
+    "Hung Hom", "To Kwa Wan", "Kowloon City", "Diamond Hill",
+    "Wong Tai Sin", "Kowloon Tong", "Prince Edward"
+]
+
+# Precompiled once at import; matches whole words only, case-insensitive
+_DISTRICT_RE = re.compile(
+    r"\b(" + "|".join(re.escape(d) for d in sorted(HK_DISTRICTS, key=len, reverse=True)) + r")\b",
+    re.IGNORECASE
+)
+_DISTRICT_NAMES = {d.lower(): d for d in HK_DISTRICTS}
+
 
 def extract_district(text: str) -> str:
     """
     Extract Hong Kong district from text.
     """
-    HK_DISTRICTS = [
-        "Central", "Sheung Wan", "Wan Chai", "Causeway Bay", "Admiralty",
-        "Tsim Sha Tsui", "TST", "Mong Kok", "Jordan", "Yau Ma Tei",
-        "Sai Kung", "Stanley", "Repulse Bay", "Aberdeen", "Kennedy Town",
-        "Sham Shui Po", "Kwun Tong", "Tai Hang", "Tin Hau", "Fortress Hill",
-        "North Point", "Quarry Bay", "Tai Koo", "Shau Kei Wan",
-        "Hung Hom", "To Kwa Wan", "Kowloon City", "Diamond Hill",
-        "Wong Tai Sin", "Kowloon Tong", "Prince Edward"
-    ]
-    
-    text_lower = text.lower()
-    for district in HK_DISTRICTS:
-        if district.lower() in text_lower:
-            return district
-    
-    return None
+    match = _DISTRICT_RE.search(text)
+    return _DISTRICT_NAMES[match.group(1).lower()] if match else None
 
 
 def extract_tags(caption: str) -> list:
@@ -191,6 +191,19 @@ async def get_current_user(
     return user
 
 
+async def get_current_user_released(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+) -> User:
+    """
+    get_current_user for endpoints that go on to wait on slow external APIs
+    (OpenAI, Google). Ends the lookup's transaction so its pooled connection
+    goes back to the pool meanwhile; the next query checks one out again.
+    """
+    await db.commit()
+    return current_user
+
+
 async def get_current_user_optional(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
     db: AsyncSession = Depends(get_db)
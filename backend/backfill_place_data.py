@@ -13,95 +13,115 @@ Usage:
 import asyncio
 import os
 import sys
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from database import DATABASE_URL
+from datetime import datetime
+from sqlalchemy import Text, cast, select, update, or_
+from database import AsyncSessionLocal, engine
+from http_client import close_http_client
 from models import Place
-from google_places_helper import _get_place_details, _format_place_data
+from google_places_helper import _get_place_details_async
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Create async engine
-engine = create_async_engine(DATABASE_URL, echo=False)
-AsyncSessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+# Max Google Place Details requests in flight
+CONCURRENCY = 10
+
+# JSON encodings of an empty opening_hours value
+EMPTY_JSON_VALUES = ("null", '""', "[]", "{}")
 
 
 async def backfill_places():
     """Backfill missing data for all places"""
     
     async with AsyncSessionLocal() as db:
-        # Get all places
-        result = await db.execute(select(Place))
-        places = result.scalars().all()
+        # Only load places that are missing something
+        result = await db.execute(
+            select(Place.id, Place.name, Place.google_place_id, Place.opening_hours, Place.photo_url)
+            .where(or_(
+                Place.opening_hours.is_(None),
+                cast(Place.opening_hours, Text).in_(EMPTY_JSON_VALUES),
+                Place.photo_url.is_(None),
+                Place.photo_url == "",
+            ))
+        )
+        places = result.all()
         
-        logger.info(f"📊 Found {len(places)} places to check")
+        logger.info(f"📊 Found {len(places)} places missing data")
         
-        updated_count = 0
         failed_count = 0
+        to_fetch = []
         
         for place in places:
-            # Check if missing data
-            needs_update = False
-            
             if not place.opening_hours:
                 logger.info(f"⚠️ {place.name} missing opening_hours")
-                needs_update = True
-            
             if not place.photo_url:
                 logger.info(f"⚠️ {place.name} missing photo_url")
-                needs_update = True
-            
-            if not needs_update:
-                logger.info(f"✅ {place.name} has complete data")
-                continue
             
-            # Fetch fresh data from Google
             if not place.google_place_id:
                 logger.warning(f"⚠️ {place.name} has no google_place_id, skipping")
                 failed_count += 1
                 continue
             
-            logger.info(f"🔄 Fetching fresh data for {place.name}...")
-            
-            place_details = _get_place_details(place.google_place_id)
-            
+            to_fetch.append(place)
+        
+        # Fetch fresh data from Google concurrently, capped to stay under rate limits
+        semaphore = asyncio.Semaphore(CONCURRENCY)
+        
+        async def fetch_details(place):
+            async with semaphore:
+                logger.info(f"🔄 Fetching fresh data for {place.name}...")
+                return await _get_place_details_async(place.google_place_id)
+        
+        fetched = await asyncio.gather(*(fetch_details(place) for place in to_fetch))
+        
+        GOOGLE_API_KEY = os.getenv("GOOGLE_PLACES_API_KEY")
+        updates = []
+        
+        for place, place_details in zip(to_fetch, fetched):
             if not place_details:
                 logger.error(f"❌ Failed to fetch data for {place.name}")
                 failed_count += 1
                 continue
             
+            values = {}
+            
             # Update opening hours
             if not place.opening_hours:
-                opening_hours_data = place_details.get("opening_hours", {})
-                if opening_hours_data:
-                    weekday_text = opening_hours_data.get("weekday_text", [])
-                    if weekday_text:
-                        import json
-                        place.opening_hours = json.dumps(weekday_text)
-                        logger.info(f"  ✅ Added opening_hours")
+                weekday_text = (place_details.get("opening_hours") or {}).get("weekday_text", [])
+                if weekday_text:
+                    values["opening_hours"] = weekday_text
+                    logger.info(f"  ✅ Added opening_hours for {place.name}")
             
             # Update photo
             if not place.photo_url:
                 photos = place_details.get("photos", [])
-                if photos:
-                    photo_reference = photos[0].get("photo_reference")
-                    if photo_reference:
-                        GOOGLE_API_KEY = os.getenv("GOOGLE_PLACES_API_KEY")
-                        place.photo_url = f"https://maps.googleapis.com/maps/api/place/photo?maxwidth=800&photoreference={photo_reference}&key={GOOGLE_API_KEY}"
-                        logger.info(f"  ✅ Added photo_url")
+                photo_reference = photos[0].get("photo_reference") if photos else None
+                if photo_reference:
+                    values["photo_url"] = f"https://maps.googleapis.com/maps/api/place/photo?maxwidth=800&photoreference={photo_reference}&key={GOOGLE_API_KEY}"
+                    logger.info(f"  ✅ Added photo_url for {place.name}")
             
-            updated_count += 1
+            if values:
+                updates.append({"id": place.id, "updated_at": datetime.utcnow(), **values})
         
-        # Commit all changes
+        # Write all changes as one bulk UPDATE by primary key and a single commit
+        if updates:
+            await db.execute(update(Place), updates)
         await db.commit()
         
         logger.info(f"\n🎉 Backfill complete!")
-        logger.info(f"  ✅ Updated: {updated_count}")
+        logger.info(f"  ✅ Updated: {len(updates)}")
         logger.info(f"  ❌ Failed: {failed_count}")
-        logger.info(f"  📊 Total: {len(places)}")
+        logger.info(f"  📊 Checked: {len(places)}")
+
+
+async def main():
+    try:
+        await backfill_places()
+    finally:
+        await close_http_client()
+        await engine.dispose()
 
 
 if __name__ == "__main__":
-    asyncio.run(backfill_places())
+    asyncio.run(main())
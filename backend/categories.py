@@ -0,0 +1,82 @@
+"""
+Radar Backend - Categories
+Emoji mapping and tag/type -> category rules, kept apart from the ORM models
+"""
+
+from functools import lru_cache
+from types import MappingProxyType
+
+
+# Category to Emoji mapping (Corner-style), read-only
+CATEGORY_EMOJIS = MappingProxyType({
+    "eat": "🍽️",           # Restaurants
+    "cafes": "☕",         # Cafes
+    "bars": "🍸",          # Bars & nightlife
+    "shops": "🛍️",        # Shopping
+    "leisure": "🎭",       # Entertainment, activities
+    "go_out": "✨",        # Events, experiences
+    "nature": "🌳",        # Parks, hiking
+    "culture": "🎨",       # Museums, galleries
+    "fitness": "💪",       # Gyms, sports
+    "beauty": "💅",        # Salons, spas
+    "default": "📍"        # Fallback
+})
+
+# /categories payload, built once
+CATEGORY_LIST = tuple(
+    {"id": key, "name": key.replace("_", " ").title(), "emoji": emoji}
+    for key, emoji in CATEGORY_EMOJIS.items()
+    if key != "default"
+)
+
+
+@lru_cache(maxsize=64)  # Small fixed category space; skips .lower() per call
+def get_emoji_for_category(category: str) -> str:
+    """Get emoji for a category"""
+    return CATEGORY_EMOJIS.get(category.lower(), CATEGORY_EMOJIS["default"])
+
+
+# (keywords, category) checked in priority order. Keywords match Google Places
+# API type strings as well as AI-extracted tags.
+CATEGORY_RULES = [
+    # Cafes (Google Places: "cafe", "coffee_shop")
+    (frozenset({"cafe", "coffee", "espresso", "latte", "cappuccino", "coffee_shop"}), "cafes"),
+    # Bars (Google Places: "bar", "night_club", "liquor_store")
+    (frozenset({"bar", "cocktail", "wine", "beer", "pub", "nightlife", "night_club", "liquor_store"}), "bars"),
+    # Shops (Google Places: "store", "clothing_store", "shopping_mall")
+    (frozenset({"shop", "store", "boutique", "retail", "shopping", "clothing_store", "shopping_mall", "book_store", "jewelry_store"}), "shops"),
+    # Leisure (Google Places: "movie_theater", "amusement_park", "bowling_alley")
+    (frozenset({"cinema", "theater", "entertainment", "activity", "fun", "movie_theater", "amusement_park", "bowling_alley", "casino", "stadium"}), "leisure"),
+    # Go out (Google Places: "night_club", "tourist_attraction")
+    (frozenset({"event", "party", "club", "experience", "rooftop", "tourist_attraction"}), "go_out"),
+    # Nature (Google Places: "park", "natural_feature", "campground")
+    (frozenset({"park", "nature", "hiking", "beach", "outdoor", "natural_feature", "campground"}), "nature"),
+    # Culture (Google Places: "museum", "art_gallery", "library")
+    (frozenset({"museum", "gallery", "art", "culture", "exhibition", "art_gallery", "library"}), "culture"),
+    # Restaurants (Google Places: "restaurant", "meal_delivery", "meal_takeaway")
+    # Checked LAST because many places have "restaurant" as a secondary type
+    (frozenset({"restaurant", "dining", "food", "cuisine", "noodles", "dim sum", "meal_delivery", "meal_takeaway"}), "eat"),
+]
+
+
+# Reverse index: keyword -> (rule priority, category). A keyword listed under
+# several rules keeps the earliest one, so lookups honour CATEGORY_RULES order.
+KEYWORD_TO_CATEGORY = {}
+for _priority, (_keywords, _category) in enumerate(CATEGORY_RULES):
+    for _keyword in _keywords:
+        KEYWORD_TO_CATEGORY.setdefault(_keyword, (_priority, _category))
+
+
+def get_category_from_tags(tags: list) -> str:
+    """
+    Determine category from Google Places types or AI-extracted tags
+    Matches Google Places API type strings
+    """
+    if not tags:
+        return "eat"  # Default
+    
+    # One hash lookup per tag; the highest-priority rule hit wins
+    best = min(filter(None, map(KEYWORD_TO_CATEGORY.get, map(str.lower, tags))), default=None)
+    
+    # Default to eat (most common)
+    return best[1] if best else "eat"
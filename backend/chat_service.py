@@ -4,9 +4,12 @@ Uses OpenAI to provide personalized place suggestions
 """
 
 import os
+import logging
 from openai import OpenAI
 from typing import List, Dict
 
+logger = logging.getLogger(__name__)
+
 client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
 async def get_chat_response(
@@ -75,7 +78,7 @@ When recommending places:
         return response.choices[0].message.content
         
     except Exception as e:
-        print(f"❌ Chat error: {e}")
+        logger.exception("❌ Chat error")
         return "Sorry, I'm having trouble connecting right now. Try again in a moment! 🙏"
 
 
@@ -139,5 +142,5 @@ Focus on real, popular places in Hong Kong."""
         return recommendations
         
     except Exception as e:
-        print(f"❌ Recommendations error: {e}")
+        logger.exception("❌ Recommendations error")
         return []
@@ -5,7 +5,9 @@ Async SQLAlchemy with PostgreSQL/SQLite fallback
 
 import os
 import logging
+import orjson
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy.engine import make_url
 from sqlalchemy.pool import NullPool
 
 logger = logging.getLogger(__name__)
@@ -24,14 +26,32 @@ else:
     logger.warning("⚠️ DATABASE_URL not set. Using SQLite: ./radar.db")
     logger.warning("⚠️ For production, add PostgreSQL in Railway!")
 
-print("DEBUG: FINAL DATABASE_URL =", DATABASE_URL)
+logger.debug("Database URL: %s", make_url(DATABASE_URL).render_as_string(hide_password=True))
+
+# Connection pool settings
+# SQLite: no pooling. PostgreSQL: persistent pool of warm connections.
+# The pool is per worker process, so total connections to Postgres are
+# WEB_CONCURRENCY * (DB_POOL_SIZE + DB_MAX_OVERFLOW)
+if "sqlite" in DATABASE_URL:
+    pool_kwargs = {"poolclass": NullPool}
+else:
+    pool_kwargs = {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", 20)),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", 10)),
+        "pool_timeout": 30,
+        "pool_recycle": 1800,  # Recycle before server-side idle timeouts
+        "pool_pre_ping": True,
+    }
 
 # Create async engine
 engine = create_async_engine(
     DATABASE_URL,
     echo=False,
-    poolclass=NullPool if "sqlite" in DATABASE_URL else None,
-    pool_pre_ping=True if "postgresql" in DATABASE_URL else False,
+    query_cache_size=1200,  # Compiled-SQL cache; default 500 is tight across all endpoints
+    # tags / tags_lower / opening_hours JSON columns go through orjson, not stdlib json
+    json_serializer=lambda value: orjson.dumps(value).decode(),
+    json_deserializer=orjson.loads,
+    **pool_kwargs,
 )
 
 # Async session maker
@@ -4,176 +4,184 @@ Fetch canonical venue data for place enrichment
 """
 
 import os
+import re
+import asyncio
 import logging
 from typing import Optional, Dict, List
-import httpx
+from cachetools import TTLCache
+from http_client import get_http_client
 
 logger = logging.getLogger(__name__)
 
 GOOGLE_PLACES_API_KEY = os.getenv("GOOGLE_PLACES_API_KEY", "").strip()
 
-# API endpoints
-PLACES_TEXT_SEARCH_URL = "https://maps.googleapis.com/maps/api/place/textsearch/json"
-PLACES_DETAILS_URL = "https://maps.googleapis.com/maps/api/place/details/json"
-PLACES_PHOTO_URL = "https://maps.googleapis.com/maps/api/place/photo"
+# Places API (New): one searchText call returns search + details fields
+PLACES_SEARCH_TEXT_URL = "https://places.googleapis.com/v1/places:searchText"
+PLACES_MEDIA_URL = "https://places.googleapis.com/v1/{name}/media"
+SEARCH_TEXT_FIELD_MASK = ",".join([
+    "places.id",
+    "places.displayName",
+    "places.formattedAddress",
+    "places.location",
+    "places.rating",
+    "places.priceLevel",
+    "places.regularOpeningHours.weekdayDescriptions",
+    "places.currentOpeningHours.openNow",
+    "places.nationalPhoneNumber",
+    "places.websiteUri",
+    "places.photos",
+    "places.types",
+])
+HK_LOCATION_BIAS = {
+    "circle": {"center": {"latitude": 22.3193, "longitude": 114.1694}, "radius": 50000.0}
+}
+# Places API (New) returns priceLevel as an enum; the DB stores the legacy 0-4 int
+PRICE_LEVELS = {
+    "PRICE_LEVEL_FREE": 0,
+    "PRICE_LEVEL_INEXPENSIVE": 1,
+    "PRICE_LEVEL_MODERATE": 2,
+    "PRICE_LEVEL_EXPENSIVE": 3,
+    "PRICE_LEVEL_VERY_EXPENSIVE": 4,
+}
 
+HK_DISTRICTS = [
+    "Central", "Admiralty", "Wan Chai", "Causeway Bay",
+    "Tsim Sha Tsui", "TST", "Mong Kok", "Jordan", "Yau Ma Tei",
+    "Sham Shui Po", "Sai Ying Pun", "Sheung Wan", "Kennedy Town",
+    "Quarry Bay", "Tai Koo", "North Point", "Fortress Hill",
+    "Tin Hau", "Tai Hang", "Happy Valley", "Mid-Levels",
+    "Stanley", "Repulse Bay", "Aberdeen", "Wong Chuk Hang",
+    "Kowloon Tong", "Hung Hom", "To Kwa Wan", "Kowloon City",
+    "Kwun Tong", "Ngau Tau Kok", "Lam Tin", "Yau Tong",
+    "Sha Tin", "Tai Po", "Fanling", "Sheung Shui",
+    "Tuen Mun", "Yuen Long", "Tsuen Wan", "Kwai Chung",
+    "Tsing Yi", "Tung Chung", "Discovery Bay", "Sai Kung",
+]
 
-async def search_place(name: str, district: str = None, region: str = "Hong Kong") -> Optional[Dict]:
+# Single regex pass over an address instead of a substring test per district.
+# Longest names first so overlapping alternatives resolve to the fuller name.
+_DISTRICT_RE = re.compile(
+    r"\b(" + "|".join(re.escape(d) for d in sorted(HK_DISTRICTS, key=len, reverse=True)) + r")\b",
+    re.IGNORECASE
+)
+_DISTRICT_NAMES = {d.lower(): d for d in HK_DISTRICTS}
+
+# Enriched place data keyed by normalized (name, district). Re-imports and
+# repeated venue names skip both paid Google calls; keep hits for a day.
+_enrich_cache = TTLCache(maxsize=10_000, ttl=60 * 60 * 24)
+
+# In-flight enrichments by the same key, so concurrent pins/imports of one
+# venue share a single Google call instead of each missing the cache
+_enrich_inflight: Dict[tuple, asyncio.Task] = {}
+
+
+async def search_place_with_details(name: str, district: str = None, region: str = "Hong Kong") -> Optional[Dict]:
     """
-    Search for a place using Google Places Text Search
-    Returns the best matching place with basic info
+    Search for a place using Places API (New) Text Search
+    Returns search and details fields in a single round-trip
     """
     if not GOOGLE_PLACES_API_KEY:
         logger.warning("⚠️ GOOGLE_PLACES_API_KEY not set. Place enrichment disabled.")
         return None
     
-    # Build search query
     query = name
     if district:
         query += f", {district}"
     query += f", {region}"
     
-    logger.info(f"🔍 Searching Google Places: {query}")
+    logger.info(f"🔍 Searching Google Places (searchText): {query}")
     
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(
-                PLACES_TEXT_SEARCH_URL,
-                params={
-                    "query": query,
-                    "key": GOOGLE_PLACES_API_KEY,
-                    "region": "hk",  # Bias to Hong Kong
-                }
-            )
-            response.raise_for_status()
-            data = response.json()
-        
-        if data.get("status") != "OK":
-            logger.warning(f"⚠️ Google Places API error: {data.get('status')}")
-            return None
+        client = get_http_client()
+        response = await client.post(
+            PLACES_SEARCH_TEXT_URL,
+            headers={
+                "X-Goog-Api-Key": GOOGLE_PLACES_API_KEY,
+                "X-Goog-FieldMask": SEARCH_TEXT_FIELD_MASK,
+            },
+            json={
+                "textQuery": query,
+                "regionCode": "hk",
+                "pageSize": 1,
+                "locationBias": HK_LOCATION_BIAS,
+            }
+        )
+        response.raise_for_status()
+        places = response.json().get("places", [])
         
-        results = data.get("results", [])
-        if not results:
+        if not places:
             logger.warning(f"⚠️ No results found for: {query}")
             return None
         
-        # Return first (best) result
-        place = results[0]
-        
-        return {
-            "place_id": place.get("place_id"),
-            "name": place.get("name"),
-            "address": place.get("formatted_address"),
-            "lat": place.get("geometry", {}).get("location", {}).get("lat"),
-            "lng": place.get("geometry", {}).get("location", {}).get("lng"),
-            "rating": place.get("rating"),
-            "photo_reference": place.get("photos", [{}])[0].get("photo_reference") if place.get("photos") else None,
-        }
-    
-    except Exception as e:
-        logger.error(f"❌ Error searching Google Places: {e}")
-        return None
-
-
-async def get_place_details(place_id: str) -> Optional[Dict]:
-    """
-    Get detailed information about a place
-    Returns full place data including hours, phone, website
-    """
-    if not GOOGLE_PLACES_API_KEY:
-        return None
-    
-    logger.info(f"📍 Fetching place details: {place_id}")
-    
-    try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(
-                PLACES_DETAILS_URL,
-                params={
-                    "place_id": place_id,
-                    "fields": "name,formatted_address,geometry,rating,price_level,opening_hours,formatted_phone_number,website,photos,types",
-                    "key": GOOGLE_PLACES_API_KEY,
-                }
-            )
-            response.raise_for_status()
-            data = response.json()
-        
-        if data.get("status") != "OK":
-            logger.warning(f"⚠️ Google Places Details API error: {data.get('status')}")
-            return None
-        
-        result = data.get("result", {})
+        place = places[0]
         
-        # Extract opening hours
         opening_hours = None
-        if result.get("opening_hours"):
+        weekday_text = place.get("regularOpeningHours", {}).get("weekdayDescriptions")
+        if weekday_text:
             opening_hours = {
-                "open_now": result["opening_hours"].get("open_now"),
-                "weekday_text": result["opening_hours"].get("weekday_text", []),
+                "open_now": place.get("currentOpeningHours", {}).get("openNow"),
+                "weekday_text": weekday_text,
             }
         
-        # Extract first photo reference
-        photo_reference = None
-        if result.get("photos"):
-            photo_reference = result["photos"][0].get("photo_reference")
+        photos = place.get("photos")
+        photo_url = get_media_url(photos[0].get("name")) if photos else None
         
         return {
-            "place_id": place_id,
-            "name": result.get("name"),
-            "address": result.get("formatted_address"),
-            "lat": result.get("geometry", {}).get("location", {}).get("lat"),
-            "lng": result.get("geometry", {}).get("location", {}).get("lng"),
-            "rating": result.get("rating"),
-            "price_level": result.get("price_level"),
-            "phone": result.get("formatted_phone_number"),
-            "website": result.get("website"),
+            "place_id": place.get("id"),
+            "name": place.get("displayName", {}).get("text"),
+            "address": place.get("formattedAddress"),
+            "lat": place.get("location", {}).get("latitude"),
+            "lng": place.get("location", {}).get("longitude"),
+            "rating": place.get("rating"),
+            "price_level": PRICE_LEVELS.get(place.get("priceLevel")),
+            "phone": place.get("nationalPhoneNumber"),
+            "website": place.get("websiteUri"),
             "opening_hours": opening_hours,
-            "photo_reference": photo_reference,
-            "types": result.get("types", []),
+            "photo_url": photo_url,
+            "types": place.get("types", []),
         }
     
     except Exception as e:
-        logger.error(f"❌ Error fetching place details: {e}")
+        logger.error(f"❌ Error searching Google Places: {e}")
         return None
 
 
-def get_photo_url(photo_reference: str, max_width: int = 800) -> str:
+def get_media_url(photo_name: str, max_width: int = 800) -> str:
     """
-    Generate Google Places photo URL
+    Generate Places API (New) photo media URL from a photo resource name
     """
-    if not GOOGLE_PLACES_API_KEY or not photo_reference:
+    if not GOOGLE_PLACES_API_KEY or not photo_name:
         return None
     
-    return f"{PLACES_PHOTO_URL}?maxwidth={max_width}&photo_reference={photo_reference}&key={GOOGLE_PLACES_API_KEY}"
+    return f"{PLACES_MEDIA_URL.format(name=photo_name)}?maxWidthPx={max_width}&key={GOOGLE_PLACES_API_KEY}"
 
 
 async def enrich_place_data(name: str, district: str = None) -> Optional[Dict]:
     """
-    Complete flow: Search + Get Details + Generate Photo URL
+    Complete flow: one searchText call (search + details + photo)
     Returns fully enriched place data ready for database
     """
-    # Step 1: Search for place
-    search_result = await search_place(name, district)
-    if not search_result:
-        logger.warning(f"⚠️ Could not find place: {name}")
-        return None
+    cache_key = (" ".join(name.lower().split()), " ".join((district or "").lower().split()))
+    cached = _enrich_cache.get(cache_key)
+    if cached is not None:
+        logger.info(f"🔍 Enrich cache hit for: '{name}'")
+        return cached
     
-    place_id = search_result.get("place_id")
-    if not place_id:
-        return search_result  # Return basic data
+    task = _enrich_inflight.get(cache_key)
+    if task is None:
+        task = asyncio.ensure_future(search_place_with_details(name, district))
+        _enrich_inflight[cache_key] = task
+        task.add_done_callback(lambda _: _enrich_inflight.pop(cache_key, None))
     
-    # Step 2: Get detailed info
-    details = await get_place_details(place_id)
+    # Shield so one caller disconnecting doesn't cancel the shared lookup
+    details = await asyncio.shield(task)
     if not details:
-        return search_result  # Fallback to search result
-    
-    # Step 3: Generate photo URL
-    photo_reference = details.get("photo_reference")
-    if photo_reference:
-        details["photo_url"] = get_photo_url(photo_reference)
+        logger.warning(f"⚠️ Could not find place: {name}")
+        return None
     
     logger.info(f"✅ Enriched place: {details.get('name')}")
     
+    _enrich_cache[cache_key] = details
     return details
 
 
@@ -181,23 +189,5 @@ def extract_district_from_address(address: str) -> Optional[str]:
     """
     Extract Hong Kong district from address
     """
-    hk_districts = [
-        "Central", "Admiralty", "Wan Chai", "Causeway Bay",
-        "Tsim Sha Tsui", "TST", "Mong Kok", "Jordan", "Yau Ma Tei",
-        "Sham Shui Po", "Sai Ying Pun", "Sheung Wan", "Kennedy Town",
-        "Quarry Bay", "Tai Koo", "North Point", "Fortress Hill",
-        "Tin Hau", "Tai Hang", "Happy Valley", "Mid-Levels",
-        "Stanley", "Repulse Bay", "Aberdeen", "Wong Chuk Hang",
-        "Kowloon Tong", "Hung Hom", "To Kwa Wan", "Kowloon City",
-        "Kwun Tong", "Ngau Tau Kok", "Lam Tin", "Yau Tong",
-        "Sha Tin", "Tai Po", "Fanling", "Sheung Shui",
-        "Tuen Mun", "Yuen Long", "Tsuen Wan", "Kwai Chung",
-        "Tsing Yi", "Tung Chung", "Discovery Bay", "Sai Kung",
-    ]
-    
-    address_lower = address.lower()
-    for district in hk_districts:
-        if district.lower() in address_lower:
-            return district
-    
-    return None
+    match = _DISTRICT_RE.search(address)
+    return _DISTRICT_NAMES[match.group(1).lower()] if match else None
@@ -3,14 +3,43 @@ Google Places Autocomplete for manual search
 """
 
 import os
+import asyncio
 import logging
-import httpx
+from http_client import get_http_client
 from typing import List, Optional, Dict
+from cachetools import TTLCache
 
 logger = logging.getLogger(__name__)
 
 GOOGLE_PLACES_API_KEY = os.getenv("GOOGLE_PLACES_API_KEY", "").strip()
 
+# (results, raw prediction count) keyed by (normalized query, location).
+# Popular names recommended by /chat repeat across users, so keep hits for a day.
+_autocomplete_cache = TTLCache(maxsize=4096, ttl=60 * 60 * 24)
+
+# Place Details by place_id. Every autocomplete prediction needs one, and
+# the same venues come up across keystrokes, users and /add-place-by-id
+_details_cache = TTLCache(maxsize=10_000, ttl=60 * 60 * 24)
+
+# Google returns at most 5 predictions; fewer than that means the prefix's
+# matches were exhaustive, so longer queries can be narrowed locally. Judged
+# on the raw prediction count: results drop predictions whose Details failed
+AUTOCOMPLETE_PAGE_SIZE = 5
+
+
+def _narrow_cached_prefix(normalized: str, location: str) -> Optional[List[Dict]]:
+    """Filter the cached results of the longest shorter prefix, if exhaustive"""
+    for end in range(len(normalized) - 1, 1, -1):
+        entry = _autocomplete_cache.get((normalized[:end], location))
+        if entry is None:
+            continue
+        broader, prediction_count = entry
+        if prediction_count >= AUTOCOMPLETE_PAGE_SIZE:
+            return None
+        narrowed = [r for r in broader if normalized in f"{r['name']} {r['address']}".lower()]
+        return narrowed or None
+    return None
+
 
 async def autocomplete_search(query: str, location: str = "22.3193,114.1694") -> List[Dict]:
     """
@@ -28,6 +57,21 @@ async def autocomplete_search(query: str, location: str = "22.3193,114.1694") ->
         logger.error("❌ Google Places API key not configured!")
         return []
     
+    normalized = " ".join(query.lower().split())
+    cache_key = (normalized, location)
+    cached = _autocomplete_cache.get(cache_key)
+    if cached is not None:
+        logger.info(f"🔍 Autocomplete cache hit for: '{query}'")
+        return cached[0]
+    
+    # Typing "caf" -> "cafe": narrow the shorter prefix's results instead of
+    # paying for another API call. Not cached under this key: only real API
+    # responses carry a trustworthy prediction count
+    narrowed = _narrow_cached_prefix(normalized, location)
+    if narrowed:
+        logger.info(f"🔍 Autocomplete prefix hit for: '{query}'")
+        return narrowed
+    
     logger.info(f"🔍 Searching Google Places for: '{query}'")
     
     url = "https://maps.googleapis.com/maps/api/place/autocomplete/json"
@@ -42,10 +86,10 @@ async def autocomplete_search(query: str, location: str = "22.3193,114.1694") ->
     }
     
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
+        client = get_http_client()
+        response = await client.get(url, params=params)
+        response.raise_for_status()
+        data = response.json()
         
         logger.info(f"🔍 Autocomplete API response status: {data.get('status')}")
         logger.info(f"🔍 Autocomplete API response: {data}")
@@ -54,15 +98,18 @@ async def autocomplete_search(query: str, location: str = "22.3193,114.1694") ->
             logger.warning(f"⚠️ Autocomplete API status: {data.get('status')} - {data.get('error_message', 'No error message')}")
             return []
         
-        predictions = data.get("predictions", [])
+        predictions = data.get("predictions", [])[:10]  # Limit to 10 results
+        
+        # Get lat/lng from place details, all predictions concurrently
+        all_details = await asyncio.gather(
+            *(get_place_details(pred.get("place_id")) for pred in predictions)
+        )
         
         # Format results with lat/lng
         results = []
-        for pred in predictions[:10]:  # Limit to 10 results
+        for pred, details in zip(predictions, all_details):
             place_id = pred.get("place_id")
             
-            # Get lat/lng from place details
-            details = await get_place_details(place_id)
             if details:
                 results.append({
                     "place_id": place_id,
@@ -75,6 +122,8 @@ async def autocomplete_search(query: str, location: str = "22.3193,114.1694") ->
                 })
         
         logger.info(f"✅ Found {len(results)} autocomplete results for '{query}'")
+        if results:
+            _autocomplete_cache[cache_key] = (results, len(predictions))
         return results
     
     except Exception as e:
@@ -92,6 +141,10 @@ async def get_place_details(place_id: str) -> Optional[Dict]:
         logger.warning("⚠️ Google Places API key not configured")
         return None
     
+    cached = _details_cache.get(place_id)
+    if cached is not None:
+        return cached
+    
     url = "https://maps.googleapis.com/maps/api/place/details/json"
     
     params = {
@@ -101,10 +154,10 @@ async def get_place_details(place_id: str) -> Optional[Dict]:
     }
     
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
+        client = get_http_client()
+        response = await client.get(url, params=params)
+        response.raise_for_status()
+        data = response.json()
         
         if data.get("status") != "OK":
             logger.warning(f"⚠️ Place Details API status: {data.get('status')}")
@@ -138,6 +191,7 @@ async def get_place_details(place_id: str) -> Optional[Dict]:
         }
         
         logger.info(f"✅ Got place details for: {place_data.get('name')}")
+        _details_cache[place_id] = place_data
         return place_data
     
     except Exception as e:
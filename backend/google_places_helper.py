@@ -18,7 +18,10 @@ Usage:
 """
 
 import os
+import re
 import requests
+from urllib3.util.retry import Retry
+from http_client import get_http_client
 from typing import Dict, Optional, List
 import logging
 
@@ -27,6 +30,38 @@ logger = logging.getLogger(__name__)
 # Get API key from environment
 GOOGLE_API_KEY = os.getenv("GOOGLE_PLACES_API_KEY")
 
+# Keep-alive session for the sync helpers so Text Search + Details reuse one
+# pooled TLS connection to maps.googleapis.com (async calls use http_client).
+# Transient Google errors (429/5xx) are retried on the warm connection.
+_session = requests.Session()
+_session.mount("https://", requests.adapters.HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=32,
+    max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=(429, 500, 502, 503, 504)),
+))
+
+# Common HK districts, matched in one regex pass (whole words, any case)
+HK_DISTRICTS = [
+    "Central", "Sheung Wan", "Wan Chai", "Causeway Bay",
+    "Tsim Sha Tsui", "Mong Kok", "Yau Ma Tei", "Jordan",
+    "Sai Ying Pun", "Kennedy Town", "Admiralty", "Quarry Bay",
+    "Tai Hang", "Happy Valley", "Tin Hau", "Fortress Hill",
+    "North Point", "Sai Wan Ho", "Shau Kei Wan", "Chai Wan",
+    "Stanley", "Repulse Bay", "Aberdeen", "Ap Lei Chau",
+    "Hung Hom", "To Kwa Wan", "Kowloon City", "Kowloon Tong",
+    "Diamond Hill", "Wong Tai Sin", "Kwun Tong", "Lam Tin",
+    "Sham Shui Po", "Cheung Sha Wan", "Lai Chi Kok", "Mei Foo",
+    "Tsuen Wan", "Kwai Chung", "Tsing Yi", "Tuen Mun",
+    "Yuen Long", "Tin Shui Wai", "Sheung Shui", "Fanling",
+    "Tai Po", "Sha Tin", "Ma On Shan", "Sai Kung", "Tseung Kwan O"
+]
+_DISTRICT_RE = re.compile(
+    r"\b(" + "|".join(re.escape(d) for d in sorted(HK_DISTRICTS, key=len, reverse=True)) + r")\b",
+    re.IGNORECASE
+)
+_DISTRICT_NAMES = {d.lower(): d for d in HK_DISTRICTS}
+
+
 def fetch_place_details_from_google(candidate: Dict) -> Optional[Dict]:
     """
     Fetch canonical place data from Google Places API.
@@ -117,7 +152,7 @@ def _find_place_by_text(candidate: Dict) -> Optional[str]:
     url = f"https://maps.googleapis.com/maps/api/place/textsearch/json?query={requests.utils.quote(query)}{location_bias}&key={GOOGLE_API_KEY}"
     
     try:
-        response = requests.get(url, timeout=10)
+        response = _session.get(url, timeout=10)
         response.raise_for_status()
         data = response.json()
         
@@ -135,12 +170,8 @@ def _find_place_by_text(candidate: Dict) -> Optional[str]:
         return None
 
 
-def _get_place_details(place_id: str) -> Optional[Dict]:
-    """
-    Get detailed information about a place using Place Details API.
-    
-    Returns raw place details dict from Google.
-    """
+def _place_details_url(place_id: str) -> str:
+    """Build the Place Details API URL requesting all useful fields."""
     
     # Request all useful fields
     fields = [
@@ -157,24 +188,54 @@ def _get_place_details(place_id: str) -> Optional[Dict]:
     ]
     
     fields_param = ",".join(fields)
-    url = f"https://maps.googleapis.com/maps/api/place/details/json?place_id={place_id}&fields={fields_param}&key={GOOGLE_API_KEY}"
+    return f"https://maps.googleapis.com/maps/api/place/details/json?place_id={place_id}&fields={fields_param}&key={GOOGLE_API_KEY}"
+
+
+def _parse_place_details(data: Dict) -> Optional[Dict]:
+    """Return the result dict from a Place Details response, or None."""
+    
+    if data.get("status") == "OK" and data.get("result"):
+        return data["result"]
+    
+    logger.warning(f"⚠️ Place Details failed: {data.get('status')}")
+    return None
+
+
+def _get_place_details(place_id: str) -> Optional[Dict]:
+    """
+    Get detailed information about a place using Place Details API.
+    
+    Returns raw place details dict from Google.
+    """
     
     try:
-        response = requests.get(url, timeout=10)
+        response = _session.get(_place_details_url(place_id), timeout=10)
         response.raise_for_status()
-        data = response.json()
-        
-        if data.get("status") == "OK" and data.get("result"):
-            return data["result"]
-        else:
-            logger.warning(f"⚠️ Place Details failed: {data.get('status')}")
-            return None
+        return _parse_place_details(response.json())
             
     except Exception as e:
         logger.error(f"❌ Error in Place Details: {e}")
         return None
 
 
+async def _get_place_details_async(place_id: str) -> Optional[Dict]:
+    """
+    Async version of _get_place_details for running many lookups concurrently.
+    
+    Returns raw place details dict from Google.
+    """
+    
+    try:
+        client = get_http_client()
+        response = await client.get(_place_details_url(place_id))
+        response.raise_for_status()
+        return _parse_place_details(response.json())
+        
+    except Exception as e:
+        logger.error(f"❌ Error in Place Details: {e}")
+        return None
+
+
 def _format_place_data(place_details: Dict, candidate: Dict) -> Dict:
     """
     Format Google Place Details into Radar's Place model format.
@@ -260,28 +321,42 @@ def _extract_district_from_address(address: str) -> Optional[str]:
     
     Example: "11-15 Bridges St, Central, Hong Kong" → "Central"
     """
-    
-    # Common HK districts
-    districts = [
-        "Central", "Sheung Wan", "Wan Chai", "Causeway Bay",
-        "Tsim Sha Tsui", "Mong Kok", "Yau Ma Tei", "Jordan",
-        "Sai Ying Pun", "Kennedy Town", "Admiralty", "Quarry Bay",
-        "Tai Hang", "Happy Valley", "Tin Hau", "Fortress Hill",
-        "North Point", "Sai Wan Ho", "Shau Kei Wan", "Chai Wan",
-        "Stanley", "Repulse Bay", "Aberdeen", "Ap Lei Chau",
-        "Hung Hom", "To Kwa Wan", "Kowloon City", "Kowloon Tong",
-        "Diamond Hill", "Wong Tai Sin", "Kwun Tong", "Lam Tin",
-        "Sham Shui Po", "Cheung Sha Wan", "Lai Chi Kok", "Mei Foo",
-        "Tsuen Wan", "Kwai Chung", "Tsing Yi", "Tuen Mun",
-        "Yuen Long", "Tin Shui Wai", "Sheung Shui", "Fanling",
-        "Tai Po", "Sha Tin", "Ma On Shan", "Sai Kung", "Tseung Kwan O"
-    ]
-    
-    for district in districts:
-        if district in address:
-            return district
-    
-    return None
+    match = _DISTRICT_RE.search(address)
+    return _DISTRICT_NAMES[match.group(1).lower()] if match else None
+
+
+# Google place type -> Radar (category, emoji), built once at import
+_TYPE_CATEGORIES = {
+    "bar": ("Bar", "🍸"),
+    "night_club": ("Bar", "🍸"),
+    "liquor_store": ("Bar", "🍸"),
+    
+    "cafe": ("Cafe", "☕"),
+    "coffee": ("Cafe", "☕"),
+    
+    "restaurant": ("Restaurant", "🍽️"),
+    "meal_delivery": ("Restaurant", "🍽️"),
+    "meal_takeaway": ("Restaurant", "🍽️"),
+    "food": ("Restaurant", "🍽️"),
+    
+    "tourist_attraction": ("Activity", "🎯"),
+    "museum": ("Activity", "🎯"),
+    "art_gallery": ("Activity", "🎯"),
+    "amusement_park": ("Activity", "🎯"),
+    "aquarium": ("Activity", "🎯"),
+    "bowling_alley": ("Activity", "🎯"),
+    "casino": ("Activity", "🎯"),
+    "movie_theater": ("Activity", "🎯"),
+    "night_club": ("Activity", "🎯"),
+    "park": ("Activity", "🎯"),
+    "spa": ("Activity", "🎯"),
+    "stadium": ("Activity", "🎯"),
+    "zoo": ("Activity", "🎯"),
+    
+    "shopping_mall": ("Shopping", "🛍️"),
+    "store": ("Shopping", "🛍️"),
+    "clothing_store": ("Shopping", "🛍️"),
+}
 
 
 def _infer_category_from_types(types: List[str], hint: Optional[str] = None) -> tuple:
@@ -303,43 +378,12 @@ def _infer_category_from_types(types: List[str], hint: Optional[str] = None) ->
         elif "activity" in hint_lower or "attraction" in hint_lower:
             return ("Activity", "🎯")
     
-    # Map Google types to Radar categories
-    type_mapping = {
-        "bar": ("Bar", "🍸"),
-        "night_club": ("Bar", "🍸"),
-        "liquor_store": ("Bar", "🍸"),
-        
-        "cafe": ("Cafe", "☕"),
-        "coffee": ("Cafe", "☕"),
-        
-        "restaurant": ("Restaurant", "🍽️"),
-        "meal_delivery": ("Restaurant", "🍽️"),
-        "meal_takeaway": ("Restaurant", "🍽️"),
-        "food": ("Restaurant", "🍽️"),
-        
-        "tourist_attraction": ("Activity", "🎯"),
-        "museum": ("Activity", "🎯"),
-        "art_gallery": ("Activity", "🎯"),
-        "amusement_park": ("Activity", "🎯"),
-        "aquarium": ("Activity", "🎯"),
-        "bowling_alley": ("Activity", "🎯"),
-        "casino": ("Activity", "🎯"),
-        "movie_theater": ("Activity", "🎯"),
-        "night_club": ("Activity", "🎯"),
-        "park": ("Activity", "🎯"),
-        "spa": ("Activity", "🎯"),
-        "stadium": ("Activity", "🎯"),
-        "zoo": ("Activity", "🎯"),
-        
-        "shopping_mall": ("Shopping", "🛍️"),
-        "store": ("Shopping", "🛍️"),
-        "clothing_store": ("Shopping", "🛍️"),
-    }
     
     # Check each type
     for place_type in types:
-        if place_type in type_mapping:
-            return type_mapping[place_type]
+        category = _TYPE_CATEGORIES.get(place_type)
+        if category:
+            return category
     
     # Default fallback
     return ("Place", "📍")
@@ -0,0 +1,41 @@
+"""
+Gunicorn config for production (Railway)
+Run with: gunicorn main:app -c gunicorn.conf.py
+"""
+
+import multiprocessing
+import os
+
+from uvicorn_worker import UvicornWorker
+
+
+class RadarUvicornWorker(UvicornWorker):
+    """Pin uvloop + httptools (both ship with uvicorn[standard]) instead of "auto"."""
+    CONFIG_KWARGS = {"loop": "uvloop", "http": "httptools"}
+
+
+# Bind to Railway's assigned port
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+
+# One uvicorn event loop per worker process
+worker_class = RadarUvicornWorker
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+
+# Each worker imports main -> database and builds its own engine/pool,
+# so total DB connections scale with `workers`
+preload_app = False
+
+# Split one Postgres connection budget across the workers (default 80, under
+# Postgres' default max_connections=100) instead of giving every worker the
+# single-process 20 + 10 pool. Explicit DB_POOL_SIZE / DB_MAX_OVERFLOW win.
+# Workers are forked from this process, so they inherit these env vars.
+db_connections_per_worker = max(int(os.getenv("DB_MAX_CONNECTIONS", 80)) // workers, 2)
+os.environ.setdefault("DB_POOL_SIZE", str(max(db_connections_per_worker * 2 // 3, 1)))
+os.environ.setdefault("DB_MAX_OVERFLOW", str(max(db_connections_per_worker - int(os.environ["DB_POOL_SIZE"]), 0)))
+
+timeout = int(os.getenv("WEB_TIMEOUT", 60))
+graceful_timeout = 30
+keepalive = 5
+
+accesslog = "-"
+errorlog = "-"
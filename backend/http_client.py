@@ -0,0 +1,38 @@
+"""
+Radar Backend - Shared HTTP client
+One pooled httpx.AsyncClient (HTTP/2 + keep-alive) for all outbound API calls
+"""
+
+import logging
+from typing import Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Return the shared client, creating it on first use.
+    Reusing it keeps TLS connections to Google warm and lets concurrent
+    lookups multiplex over HTTP/2 instead of handshaking per request.
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            http2=True,
+            timeout=10.0,
+            limits=httpx.Limits(max_keepalive_connections=50, max_connections=100),
+        )
+        logger.info("✅ Shared HTTP client initialized")
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared client (called on app shutdown)"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
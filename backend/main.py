@@ -8,40 +8,67 @@ from dotenv import load_dotenv
 load_dotenv()
 
 import os
+import json
+import random
+import asyncio
+import atexit
 import logging
+import queue
+import orjson
+from logging.handlers import QueueHandler, QueueListener
 from contextlib import asynccontextmanager
-from typing import List, Optional
+from typing import Dict, List, Literal, Optional
 
-from fastapi import FastAPI, Depends, HTTPException, status, Request
+from fastapi import FastAPI, Depends, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel, Field
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field, ValidationInfo, field_validator
+from cachetools import LRUCache, TTLCache
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, desc
+from openai import AsyncAzureOpenAI
+from sqlalchemy import select, update, and_, or_, desc, cast, func, table, column, lambda_stmt, Text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from datetime import datetime, timedelta
 
 # Local imports
 from database import init_db, get_db
-from models import User, Place, Event, get_emoji_for_category, get_category_from_tags
-from auth import send_otp, verify_otp, get_current_user, MVP_MODE
+from http_client import close_http_client
+from models import User, Place, Event
+from categories import CATEGORY_LIST, get_emoji_for_category, get_category_from_tags
+from auth import send_otp, verify_otp, get_current_user, get_current_user_released, MVP_MODE
 from google_places import enrich_place_data, extract_district_from_address
 from ai_extraction import process_instagram_url, extract_place_manual
 from google_places_autocomplete import autocomplete_search, get_place_details
-
-# Logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+from google_places_helper import _get_place_details_async
+
+# Logging - QueueHandler.prepare() still merges the message args in the
+# calling thread, but the timestamp/level formatting and stdout writes happen
+# on a background listener thread so request handlers never block on the stream
+_log_queue = queue.SimpleQueue()
+_log_stream = logging.StreamHandler()
+_log_stream.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+_log_listener = QueueListener(_log_queue, _log_stream)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+_log_enqueue = QueueHandler(_log_queue)
+_log_enqueue.setFormatter(logging.Formatter('%(message)s'))  # message only; the listener adds the rest
+logging.basicConfig(level=logging.INFO, handlers=[_log_enqueue])
 logger = logging.getLogger(__name__)
 
+# create_all on startup; set to false once the schema exists so every worker
+# doesn't hit the DB with a metadata round-trip before serving
+RUN_MIGRATIONS = os.getenv("RUN_MIGRATIONS", "true").lower() == "true"
+
 # Lifespan context manager
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup and shutdown events"""
     # Startup
     logger.info("🚀 Starting Radar Backend...")
-    await init_db()
+    if RUN_MIGRATIONS:
+        await init_db()
     
     if MVP_MODE:
         logger.info("⚠️ MVP MODE ENABLED - OTP bypass active (123456)")
@@ -50,6 +77,7 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("👋 Shutting down Radar Backend...")
+    await close_http_client()
 
 # Create FastAPI app
 app = FastAPI(
@@ -59,24 +87,23 @@ app = FastAPI(
     lifespan=lifespan
 )
 
-# CORS
-ALLOWED_ORIGINS = os.getenv("ALLOWED_ORIGINS", "*").split(",")
+# CORS - set ALLOWED_ORIGINS to the exact web origins in production. Auth is a
+# bearer header, so credentials are only enabled for an explicit origin list
+# (never alongside "*"). Preflights are cached by browsers for a day.
+ALLOWED_ORIGINS = [o.strip() for o in os.getenv("ALLOWED_ORIGINS", "*").split(",") if o.strip()]
 app.add_middleware(
     CORSMiddleware,
     allow_origins=ALLOWED_ORIGINS,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_credentials="*" not in ALLOWED_ORIGINS,
+    allow_methods=["GET", "POST", "PATCH", "DELETE"],
+    allow_headers=["authorization", "content-type"],
+    max_age=86400,
 )
 
-# Request logging middleware
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    """Log all requests"""
-    logger.info(f"{request.method} {request.url.path}")
-    response = await call_next(request)
-    return response
-
+# Compress JSON responses (place lists shrink several-fold on mobile networks).
+# Starlette>=1.7 leaves text/event-stream uncompressed, so /chat/stream still
+# flushes token by token
+app.add_middleware(GZipMiddleware, minimum_size=500)
 
 # ============================================================================
 # Pydantic Models (Request/Response schemas)
@@ -100,6 +127,19 @@ class ManualPinRequest(BaseModel):
     district: Optional[str] = Field(None, example="Central")
     category: Optional[str] = Field(None, example="bars")
     tags: Optional[List[str]] = Field(None, example=["cocktail", "rooftop"])
+    
+    @field_validator("name", "district")
+    @classmethod
+    def collapse_whitespace(cls, v: Optional[str], info: ValidationInfo) -> Optional[str]:
+        """Trim and collapse whitespace so Google queries and cache keys are canonical"""
+        if v is None:
+            return v
+        v = " ".join(v.split())
+        if not v:
+            if info.field_name == "name":
+                raise ValueError("name must not be blank")
+            return None
+        return v
 
 
 class UpdatePlaceRequest(BaseModel):
@@ -126,20 +166,98 @@ class PlaceResponse(BaseModel):
     is_favorite: bool
     tags: Optional[List[str]]
     source_url: Optional[str]
-    created_at: str
+    created_at: datetime
+    
+    model_config = ConfigDict(from_attributes=True)
+
+
+class PlaceCardResponse(BaseModel):
+    """Compact place card used by the home screen feeds"""
+    id: int
+    name: str
+    address: Optional[str]
+    district: Optional[str]
+    lat: float
+    lng: float
+    category: Optional[str]
+    emoji: Optional[str]
+    photo_url: Optional[str]
+    rating: Optional[float]
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+class TrendingPlaceResponse(PlaceCardResponse):
+    total_saves: int
+    recent_saves: int
+    trending_score: float
+
+
+class PickedPlaceResponse(PlaceCardResponse):
+    google_place_id: Optional[str]
+
+
+class LocalPlaceResponse(PlaceCardResponse):
+    tags: Optional[List[str]]
+
+
+# Columns backing PlaceCardResponse; feeds select these instead of the full row
+# so large JSON columns like opening_hours are never fetched or decoded
+PLACE_CARD_COLUMNS = (
+    Place.id,
+    Place.name,
+    Place.address,
+    Place.district,
+    Place.lat,
+    Place.lng,
+    Place.category,
+    Place.emoji,
+    Place.photo_url,
+    Place.rating,
+)
+
+
+# Built responses keyed by (place.id, place.updated_at) - any write bumps
+# updated_at, so stale entries are never hit and just age out of the LRU
+_place_response_cache = LRUCache(maxsize=10_000)
+
+
+# Columns read by place_to_response. /places selects just these so unused
+# TEXT columns (source_caption, user_notes, ...) aren't loaded per row.
+PLACE_RESPONSE_COLUMNS = (
+    Place.id,
+    Place.updated_at,
+    Place.name,
+    Place.address,
+    Place.district,
+    Place.lat,
+    Place.lng,
+    Place.category,
+    Place.emoji,
+    Place.photo_url,
+    Place.rating,
+    Place.opening_hours,
+    Place.google_place_id,
+    Place.is_visited,
+    Place.is_favorite,
+    Place.tags,
+    Place.source_url,
+    Place.created_at,
+)
 
 
 def place_to_response(place) -> PlaceResponse:
     """Helper to convert Place model to PlaceResponse"""
+    cache_key = (place.id, place.updated_at)
+    cached = _place_response_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
     # Parse opening_hours JSON if exists
     opening_hours_dict = None
     is_open = None
     
     if place.opening_hours:
-        import json
         if isinstance(place.opening_hours, str):
             try:
                 weekday_text = json.loads(place.opening_hours)
@@ -154,7 +272,8 @@ def place_to_response(place) -> PlaceResponse:
     # Check if open now (would need to be stored separately or calculated)
     # For now, just return None
     
-    return PlaceResponse(
+    # Row comes straight from our own DB, so skip Pydantic validation
+    response = PlaceResponse.model_construct(
         id=place.id,
         name=place.name,
         address=place.address,
@@ -172,8 +291,43 @@ def place_to_response(place) -> PlaceResponse:
         is_favorite=place.is_favorite,
         tags=place.tags,
         source_url=place.source_url,
-        created_at=place.created_at.isoformat(),
+        created_at=place.created_at,
     )
+    
+    _place_response_cache[cache_key] = response
+    return response
+
+
+# Saved google_place_ids per user. The cache is per process: a write drops
+# the entry only in the worker that served it, so with several gunicorn
+# workers /trending can keep showing a just-saved venue for up to the 60s TTL
+_saved_place_ids_cache = TTLCache(maxsize=10_000, ttl=60)
+
+
+async def get_saved_place_ids(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+) -> frozenset:
+    """Dependency returning the google_place_ids the current user has saved"""
+    cached = _saved_place_ids_cache.get(current_user.id)
+    if cached is not None:
+        return cached
+    
+    result = await db.execute(
+        select(Place.google_place_id)
+        .where(
+            Place.user_id == current_user.id,
+            Place.google_place_id.isnot(None)
+        )
+    )
+    saved_place_ids = frozenset(result.scalars().all())
+    _saved_place_ids_cache[current_user.id] = saved_place_ids
+    return saved_place_ids
+
+
+def invalidate_saved_place_ids(user_id: int) -> None:
+    """Drop a user's cached saved ids after they add or delete a place"""
+    _saved_place_ids_cache.pop(user_id, None)
 
 
 # ============================================================================
@@ -224,7 +378,7 @@ async def get_current_user_endpoint(
     return {
         "id": current_user.id,
         "phone_number": current_user.phone_number,
-        "created_at": current_user.created_at.isoformat(),
+        "created_at": current_user.created_at,
     }
 
 
@@ -232,10 +386,71 @@ async def get_current_user_endpoint(
 # Instagram Import Endpoint
 # ============================================================================
 
+def find_user_place_stmt(user_id: int, google_place_id: str):
+    """A user's existing pin for a Google place. lambda_stmt caches the built
+    statement; user_id/google_place_id are picked up as bound parameters."""
+    return lambda_stmt(
+        lambda: select(Place).where(
+            Place.user_id == user_id,
+            Place.google_place_id == google_place_id
+        )
+    )
+
+
+# (Place column, enrichment key) pairs copied verbatim from Google data by
+# every endpoint that pins a place
+GOOGLE_PLACE_FIELDS = (
+    ("name", "name"),
+    ("address", "address"),
+    ("lat", "lat"),
+    ("lng", "lng"),
+    ("google_place_id", "place_id"),
+    ("photo_url", "photo_url"),
+    ("rating", "rating"),
+    ("price_level", "price_level"),
+    ("opening_hours", "opening_hours"),
+    ("phone", "phone"),
+    ("website", "website"),
+)
+
+
+def google_place_fields(google_data: dict) -> dict:
+    """Place kwargs taken straight from enrich_place_data/get_place_details"""
+    return {attr: google_data.get(key) for attr, key in GOOGLE_PLACE_FIELDS}
+
+
+async def save_place(db: AsyncSession, place: Place) -> tuple:
+    """
+    Insert a new pin, or return the user's existing pin for the same venue.
+    One INSERT ... ON CONFLICT DO NOTHING RETURNING against the unique
+    (user_id, google_place_id) index; only duplicates pay for a SELECT.
+    Returns (place, created).
+    """
+    insert = pg_insert if db.bind.dialect.name == "postgresql" else sqlite_insert
+    values = {
+        c.key: getattr(place, c.key)
+        for c in Place.__table__.columns
+        if getattr(place, c.key) is not None
+    }
+    saved = await db.scalar(
+        insert(Place).values(**values)
+        .on_conflict_do_nothing(index_elements=["user_id", "google_place_id"])
+        .returning(Place)
+    )
+    
+    if saved is None:
+        existing = await db.execute(find_user_place_stmt(place.user_id, place.google_place_id))
+        return existing.scalar_one(), False
+    
+    await db.commit()
+    invalidate_saved_place_ids(place.user_id)
+    return saved, True
+
+
 @app.post("/import-url", response_model=PlaceResponse)
 async def import_url(
     request: ImportURLRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_user_released),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -244,7 +459,7 @@ async def import_url(
     """
     url = request.url
     
-    logger.info(f"📥 Importing URL: {url}")
+    logger.info("📥 Importing URL: %s", url)
     
     # Step 1: AI extraction
     ai_data = await process_instagram_url(url)
@@ -275,47 +490,23 @@ async def import_url(
     if not district and google_data.get("address"):
         district = extract_district_from_address(google_data["address"])
     
-    # Step 4: Check if place already exists for this user
-    google_place_id = google_data.get("place_id")
-    existing_place = await db.execute(
-        select(Place).where(
-            Place.user_id == current_user.id,
-            Place.google_place_id == google_place_id
-        )
-    )
-    place = existing_place.scalar_one_or_none()
-    
-    if place:
-        # Place already exists, return it
-        logger.info(f"✅ Place already exists: {place.name} ({place.emoji})")
+    # Step 4: Save, or return the user's existing pin for this venue
+    place, created = await save_place(db, Place(
+        user_id=current_user.id,
+        **google_place_fields(google_data),
+        district=district,
+        category=category,
+        emoji=emoji,
+        source_platform=ai_data.get("source_platform"),
+        source_url=url,
+        source_caption=ai_data.get("source_caption"),
+        tags=tags,
+    ))
+    
+    if created:
+        logger.info("✅ Saved new place: %s (%s)", place.name, place.emoji)
     else:
-        # Create new place
-        place = Place(
-            user_id=current_user.id,
-            name=google_data.get("name"),
-            address=google_data.get("address"),
-            district=district,
-            lat=google_data.get("lat"),
-            lng=google_data.get("lng"),
-            google_place_id=google_place_id,
-            photo_url=google_data.get("photo_url"),
-            rating=google_data.get("rating"),
-            price_level=google_data.get("price_level"),
-            opening_hours=google_data.get("opening_hours"),
-            phone=google_data.get("phone"),
-            website=google_data.get("website"),
-            category=category,
-            emoji=emoji,
-            source_platform=ai_data.get("source_platform"),
-            source_url=url,
-            source_caption=ai_data.get("source_caption"),
-            tags=tags,
-        )
-        
-        db.add(place)
-        await db.commit()
-        await db.refresh(place)
-        logger.info(f"✅ Saved new place: {place.name} ({place.emoji})")
+        logger.info("✅ Place already exists: %s (%s)", place.name, place.emoji)
     
     return place_to_response(place)
 
@@ -327,7 +518,7 @@ async def import_url(
 @app.post("/pin-place", response_model=PlaceResponse)
 async def pin_place(
     request: ManualPinRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_user_released),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -337,7 +528,7 @@ async def pin_place(
     name = request.name
     district = request.district
     
-    logger.info(f"📍 Pinning place: {name}")
+    logger.info("📍 Pinning place: %s", name)
     
     # Google Places enrichment
     google_data = await enrich_place_data(name, district)
@@ -355,31 +546,17 @@ async def pin_place(
     if not district and google_data.get("address"):
         district = extract_district_from_address(google_data["address"])
     
-    # Save to database
-    place = Place(
+    # Save to database (returns the existing pin if already saved)
+    place, _ = await save_place(db, Place(
         user_id=current_user.id,
-        name=google_data.get("name"),
-        address=google_data.get("address"),
+        **google_place_fields(google_data),
         district=district,
-        lat=google_data.get("lat"),
-        lng=google_data.get("lng"),
-        google_place_id=google_data.get("place_id"),
-        photo_url=google_data.get("photo_url"),
-        rating=google_data.get("rating"),
-        price_level=google_data.get("price_level"),
-        opening_hours=google_data.get("opening_hours"),
-        phone=google_data.get("phone"),
-        website=google_data.get("website"),
         category=category,
         emoji=emoji,
         tags=request.tags or [],
-    )
-    
-    db.add(place)
-    await db.commit()
-    await db.refresh(place)
+    ))
     
-    logger.info(f"✅ Pinned place: {place.name} ({place.emoji})")
+    logger.info("✅ Pinned place: %s (%s)", place.name, place.emoji)
     
     return place_to_response(place)
 
@@ -401,7 +578,7 @@ async def get_places(
     Supports filtering by category, district, favorites
     """
     # Build query
-    query = select(Place).where(Place.user_id == current_user.id)
+    query = select(*PLACE_RESPONSE_COLUMNS).where(Place.user_id == current_user.id)
     
     if category:
         query = query.where(Place.category == category)
@@ -416,9 +593,11 @@ async def get_places(
     query = query.order_by(Place.created_at.desc())
     
     result = await db.execute(query)
-    places = result.scalars().all()
+    places = result.all()
     
-    return [place_to_response(p) for p in places]
+    # Cache hits skip rebuilding the response for unchanged rows
+    cache_get = _place_response_cache.get
+    return [cache_get((p.id, p.updated_at)) or place_to_response(p) for p in places]
 
 
 @app.get("/places/{place_id}", response_model=PlaceResponse)
@@ -429,11 +608,11 @@ async def get_place(
 ):
     """Get single place by ID"""
     result = await db.execute(
-        select(Place).where(
+        select(*PLACE_RESPONSE_COLUMNS).where(
             and_(Place.id == place_id, Place.user_id == current_user.id)
         )
     )
-    place = result.scalar_one_or_none()
+    place = result.one_or_none()
     
     if not place:
         raise HTTPException(
@@ -452,12 +631,17 @@ async def update_place(
     db: AsyncSession = Depends(get_db)
 ):
     """Update place (mark as visited, favorite, add notes)"""
+    # Only fields that were sent
+    changes = request.model_dump(exclude_none=True)
+    
+    # One UPDATE ... RETURNING instead of SELECT + UPDATE + refresh SELECT
     result = await db.execute(
-        select(Place).where(
-            and_(Place.id == place_id, Place.user_id == current_user.id)
-        )
+        update(Place)
+        .where(and_(Place.id == place_id, Place.user_id == current_user.id))
+        .values(**changes)
+        .returning(*PLACE_RESPONSE_COLUMNS)
     )
-    place = result.scalar_one_or_none()
+    place = result.one_or_none()
     
     if not place:
         raise HTTPException(
@@ -465,18 +649,7 @@ async def update_place(
             detail="Place not found"
         )
     
-    # Update fields
-    if request.is_visited is not None:
-        place.is_visited = request.is_visited
-    
-    if request.is_favorite is not None:
-        place.is_favorite = request.is_favorite
-    
-    if request.user_notes is not None:
-        place.user_notes = request.user_notes
-    
     await db.commit()
-    await db.refresh(place)
     
     return place_to_response(place)
 
@@ -503,6 +676,7 @@ async def delete_place(
     
     await db.delete(place)
     await db.commit()
+    invalidate_saved_place_ids(current_user.id)
     
     return {"message": "Place deleted successfully"}
 
@@ -512,21 +686,35 @@ async def delete_place(
 # ============================================================================
 
 @app.get("/categories")
-def get_categories():
+async def get_categories():
     """Get all available categories with emojis"""
-    from models import CATEGORY_EMOJIS
-    
-    return [
-        {"id": key, "name": key.replace("_", " ").title(), "emoji": emoji}
-        for key, emoji in CATEGORY_EMOJIS.items()
-        if key != "default"
-    ]
+    # Static list built at import; async so it isn't dispatched to the threadpool
+    return CATEGORY_LIST
 
 
 # ============================================================================
 # Google Places Autocomplete (For manual search)
 # ============================================================================
 
+# In-flight autocomplete lookups keyed by normalized query, so identical
+# queries arriving while one is outstanding share a single Google call
+_autocomplete_inflight: Dict[str, asyncio.Task] = {}
+
+
+async def coalesced_autocomplete(query: str) -> List[Dict]:
+    """Run autocomplete_search, joining an identical in-flight lookup if any"""
+    key = query.strip().lower()
+    task = _autocomplete_inflight.get(key)
+    
+    if task is None:
+        task = asyncio.ensure_future(autocomplete_search(query))
+        _autocomplete_inflight[key] = task
+        task.add_done_callback(lambda _: _autocomplete_inflight.pop(key, None))
+    
+    # Shield so one caller disconnecting doesn't cancel the shared lookup
+    return await asyncio.shield(task)
+
+
 @app.get("/search-places")
 async def search_places(
     query: str,
@@ -539,7 +727,7 @@ async def search_places(
     if len(query) < 2:
         return {"results": []}
     
-    results = await autocomplete_search(query)
+    results = await coalesced_autocomplete(query)
     return {"results": results}
 
 
@@ -550,7 +738,7 @@ class AddPlaceByIdRequest(BaseModel):
 @app.post("/add-place-by-id")
 async def add_place_by_id(
     request: AddPlaceByIdRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_user_released),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -573,31 +761,17 @@ async def add_place_by_id(
     # Extract district
     district = extract_district_from_address(google_data.get("address", ""))
     
-    # Save to database
-    place = Place(
+    # Save to database (returns the existing pin if already saved)
+    place, _ = await save_place(db, Place(
         user_id=current_user.id,
-        name=google_data.get("name"),
-        address=google_data.get("address"),
+        **google_place_fields(google_data),
         district=district,
-        lat=google_data.get("lat"),
-        lng=google_data.get("lng"),
-        google_place_id=request.place_id,
-        photo_url=google_data.get("photo_url"),
-        rating=google_data.get("rating"),
-        price_level=google_data.get("price_level"),
-        opening_hours=google_data.get("opening_hours"),
-        phone=google_data.get("phone"),
-        website=google_data.get("website"),
         category=category,
         emoji=emoji,
         tags=types[:5],  # Use Google types as tags
-    )
+    ))
     
-    db.add(place)
-    await db.commit()
-    await db.refresh(place)
-    
-    logger.info(f"✅ Added place by ID: {place.name} ({place.emoji})")
+    logger.info("✅ Added place by ID: %s (%s)", place.name, place.emoji)
     
     return place_to_response(place)
 
@@ -632,8 +806,8 @@ async def get_events(
             "photo_url": event.photo_url,
             "location": event.location,
             "district": event.district,
-            "start_date": event.start_date.isoformat(),
-            "end_date": event.end_date.isoformat(),
+            "start_date": event.start_date,
+            "end_date": event.end_date,
             "category": event.category,
             "url": event.url,
             "time_description": event.time_description
@@ -646,9 +820,10 @@ async def get_events(
 # Trending Endpoint (For Home Screen)
 # ============================================================================
 
-@app.get("/trending")
+@app.get("/trending", response_model=List[TrendingPlaceResponse])
 async def get_trending(
     current_user: User = Depends(get_current_user),
+    user_saved_place_ids: frozenset = Depends(get_saved_place_ids),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -656,61 +831,51 @@ async def get_trending(
     - Recent saves (last 7 days) × 2
     - Medium-term saves (last 30 days) × 0.5
     """
-    # Get all places with save counts
-    result = await db.execute(
-        select(Place)
-        .order_by(desc(Place.created_at))
-    )
-    all_places = result.scalars().all()
-    
-    # Calculate trending scores
     now = datetime.utcnow()
     seven_days_ago = now - timedelta(days=7)
     thirty_days_ago = now - timedelta(days=30)
     
-    trending_data = []
-    for place in all_places:
-        # Count saves in different time windows
-        result_7d = await db.execute(
-            select(Place)
-            .where(
-                and_(
-                    Place.google_place_id == place.google_place_id,
-                    Place.created_at >= seven_days_ago
-                )
-            )
+    # Saves per venue in both windows, counted in one grouped pass; rows
+    # without a google_place_id count as their own venue, as in newest_per_venue
+    venue_key = func.coalesce(Place.google_place_id, cast(Place.id, Text))
+    save_counts = (
+        select(
+            venue_key.label("venue_key"),
+            func.count().filter(Place.created_at >= seven_days_ago).label("saves_7d"),
+            func.count().filter(Place.created_at >= thirty_days_ago).label("saves_30d"),
         )
-        saves_7d = len(result_7d.scalars().all())
-        
-        result_30d = await db.execute(
-            select(Place)
-            .where(
-                and_(
-                    Place.google_place_id == place.google_place_id,
-                    Place.created_at >= thirty_days_ago
-                )
-            )
+        .where(Place.created_at >= thirty_days_ago)
+        .group_by(venue_key)
+        .subquery()
+    )
+    
+    # Card columns come from each venue's newest row
+    result = await db.execute(
+        select(
+            *PLACE_CARD_COLUMNS,
+            Place.user_id,
+            Place.google_place_id,
+            save_counts.c.saves_7d,
+            save_counts.c.saves_30d,
         )
-        saves_30d = len(result_30d.scalars().all())
-        
-        # Calculate trending score
-        score = (saves_7d * 2) + (saves_30d * 0.5)
+        .join(save_counts, save_counts.c.venue_key == venue_key)
+        .where(Place.id.in_(newest_per_venue()))
+        .order_by(desc(Place.created_at))
+    )
+    
+    # Calculate trending scores
+    trending_data = []
+    for place in result.all():
+        score = (place.saves_7d * 2) + (place.saves_30d * 0.5)
         
         if score > 0:
             trending_data.append({
                 "place": place,
                 "score": score,
-                "saves_7d": saves_7d,
-                "saves_30d": saves_30d
+                "saves_7d": place.saves_7d,
+                "saves_30d": place.saves_30d
             })
     
-    # Get user's saved place IDs to exclude them
-    user_places_result = await db.execute(
-        select(Place.google_place_id)
-        .where(Place.user_id == current_user.id)
-    )
-    user_saved_place_ids = set(row[0] for row in user_places_result.all())
-    
     # Check if there are places from other users
     other_users_places = [
         item for item in trending_data 
@@ -731,22 +896,14 @@ async def get_trending(
     trending_data_filtered.sort(key=lambda x: x["score"], reverse=True)
     top_trending = trending_data_filtered[:10]
     
+    # One validation pass straight from the row mapping (extra columns ignored)
     return [
-        {
-            "id": item["place"].id,
-            "name": item["place"].name,
-            "address": item["place"].address,
-            "district": item["place"].district,
-            "lat": item["place"].lat,
-            "lng": item["place"].lng,
-            "category": item["place"].category,
-            "emoji": item["place"].emoji,
-            "photo_url": item["place"].photo_url,
-            "rating": item["place"].rating,
+        TrendingPlaceResponse.model_validate({
+            **item["place"]._mapping,
             "total_saves": item["saves_30d"],
             "recent_saves": item["saves_7d"],
-            "trending_score": item["score"]
-        }
+            "trending_score": item["score"],
+        })
         for item in top_trending
     ]
 
@@ -755,75 +912,140 @@ async def get_trending(
 # Picked For You Endpoint (For Home Screen)
 # ============================================================================
 
-@app.get("/picked-for-you")
+def newest_per_venue(*criteria):
+    """
+    Ids of the newest row per google_place_id among places matching criteria.
+    A venue has one row per user who saved it, so feeds filter on
+    Place.id.in_(newest_per_venue(...)) to list it once. row_number() runs on
+    both PostgreSQL and SQLite (3.25+); rows without a google_place_id are
+    kept as their own venue.
+    """
+    ranked = (
+        select(
+            Place.id,
+            func.row_number().over(
+                partition_by=func.coalesce(Place.google_place_id, cast(Place.id, Text)),
+                order_by=(desc(Place.created_at), desc(Place.id)),
+            ).label("rn"),
+        )
+        .where(*criteria)
+        .subquery()
+    )
+    return select(ranked.c.id).where(ranked.c.rn == 1)
+
+
+# Precomputed co-save counts (PostgreSQL, see migrations/add_place_cooccur_view.sql)
+place_cooccur = table("place_cooccur", column("src"), column("dst"), column("co_saves"))
+
+
+async def get_cooccurrence_picks(db: AsyncSession, user_saved_place_ids) -> list:
+    """
+    Item-item collaborative filtering: places most often saved alongside the
+    user's saved places, minus ones they already have, ranked by summed co-saves.
+    """
+    scores = (
+        select(place_cooccur.c.dst, func.sum(place_cooccur.c.co_saves).label("score"))
+        .where(
+            place_cooccur.c.src.in_(user_saved_place_ids),
+            place_cooccur.c.dst.not_in(user_saved_place_ids)
+        )
+        .group_by(place_cooccur.c.dst)
+        .subquery()
+    )
+    # One row per venue: place_cooccur is keyed by google_place_id, which
+    # has a row for every user who saved it
+    result = await db.execute(
+        select(*PLACE_CARD_COLUMNS, Place.google_place_id)
+        .join(scores, scores.c.dst == Place.google_place_id)
+        .where(Place.id.in_(newest_per_venue(Place.google_place_id.in_(select(scores.c.dst)))))
+        .order_by(desc(scores.c.score), desc(Place.created_at))
+        .limit(10)
+    )
+    return result.all()
+
+
+@app.get("/picked-for-you", response_model=List[PickedPlaceResponse])
 async def get_picked_for_you(
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Get AI-recommended places the user hasn't saved yet.
-    Uses collaborative filtering based on what similar users have saved.
+    Uses collaborative filtering based on what similar users have saved
+    (PostgreSQL), falling back to the newest places from other users.
     """
-    # Get all places the current user has saved
-    user_places_result = await db.execute(
+    # Places the current user has already saved
+    user_saved_place_ids = (
         select(Place.google_place_id)
-        .where(Place.user_id == current_user.id)
+        .where(
+            Place.user_id == current_user.id,
+            Place.google_place_id.isnot(None)
+        )
     )
-    user_saved_place_ids = set(row[0] for row in user_places_result.all())
     
-    # Get all places from other users that current user hasn't saved
-    all_places_result = await db.execute(
-        select(Place)
-        .where(Place.user_id != current_user.id)
+    if db.bind.dialect.name == "postgresql":
+        try:
+            recommended_places = await get_cooccurrence_picks(db, user_saved_place_ids)
+            if recommended_places:
+                return recommended_places
+        except Exception as e:
+            logger.warning("⚠️ place_cooccur unavailable, using recent places: %s", e)
+            await db.rollback()
+    
+    # Newest places from other users that the current user hasn't saved,
+    # one row per venue however many users saved it
+    result = await db.execute(
+        select(*PLACE_CARD_COLUMNS, Place.google_place_id)
+        .where(Place.id.in_(newest_per_venue(
+            Place.user_id != current_user.id,
+            Place.google_place_id.isnot(None),
+            Place.google_place_id.not_in(user_saved_place_ids)
+        )))
         .order_by(desc(Place.created_at))
+        .limit(10)
     )
-    other_users_places = all_places_result.scalars().all()
+    recommended_places = result.all()
     
     # If no other users exist, get user's own places
-    if not other_users_places:
-        user_places_result = await db.execute(
-            select(Place)
-            .where(Place.user_id == current_user.id)
-            .order_by(desc(Place.created_at))
-            .limit(10)
+    if not recommended_places:
+        other_users_result = await db.execute(
+            select(Place.id)
+            .where(Place.user_id != current_user.id)
+            .limit(1)
         )
-        recommended_places = user_places_result.scalars().all()
-    else:
-        # Filter out places user has already saved
-        recommended_places = []
-        seen_google_ids = set()
-        
-        for place in other_users_places:
-            if place.google_place_id not in user_saved_place_ids and place.google_place_id not in seen_google_ids:
-                recommended_places.append(place)
-                seen_google_ids.add(place.google_place_id)
-                
-                if len(recommended_places) >= 10:
-                    break
+        if other_users_result.first() is None:
+            user_places_result = await db.execute(
+                select(*PLACE_CARD_COLUMNS, Place.google_place_id)
+                .where(Place.user_id == current_user.id)
+                .order_by(desc(Place.created_at))
+                .limit(10)
+            )
+            recommended_places = user_places_result.all()
     
-    return [
-        {
-            "id": place.id,
-            "name": place.name,
-            "address": place.address,
-            "district": place.district,
-            "lat": place.lat,
-            "lng": place.lng,
-            "category": place.category,
-            "emoji": place.emoji,
-            "photo_url": place.photo_url,
-            "rating": place.rating,
-            "google_place_id": place.google_place_id
-        }
-        for place in recommended_places
-    ]
+    # Serialized straight from the rows by PickedPlaceResponse
+    return recommended_places
 
 
 # ============================================================================
 # Support Local Endpoint (For Home Screen)
 # ============================================================================
 
-@app.get("/support-local")
+LOCAL_TAGS = ("local", "independent", "family", "small", "neighborhood")
+
+
+def has_any_tag(tags_column, keywords):
+    """
+    SQL filter: JSON tag list contains any of keywords.
+    Matches whole quoted elements in the JSON text, e.g. '"local"', so it
+    runs on both PostgreSQL and SQLite. Use with Place.tags_lower (already
+    lowercased at write time); on PostgreSQL it is served by the pg_trgm
+    index in migrations/add_places_indexes.sql.
+    """
+    tags_text = cast(tags_column, Text)
+    return or_(*(tags_text.like(f'%"{keyword}"%') for keyword in keywords))
+
+
+@app.get("/support-local", response_model=List[LocalPlaceResponse])
 async def get_support_local(
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
@@ -832,52 +1054,38 @@ async def get_support_local(
     Get independent/family-owned businesses.
     For MVP, return places tagged with 'local', 'independent', 'family-owned'.
     """
-    result = await db.execute(
-        select(Place)
-        .order_by(desc(Place.created_at))
-        .limit(50)
-    )
-    places = result.scalars().all()
+    criteria = [has_any_tag(Place.tags_lower, LOCAL_TAGS)]
     
-    # Get user's saved place IDs to exclude them
-    user_places_result = await db.execute(
-        select(Place.google_place_id)
-        .where(Place.user_id == current_user.id)
+    # If there are other users, exclude user's saved places; otherwise include them
+    other_users_result = await db.execute(
+        select(Place.id)
+        .where(Place.user_id != current_user.id)
+        .limit(1)
     )
-    user_saved_place_ids = set(row[0] for row in user_places_result.all())
+    if other_users_result.first() is not None:
+        user_saved_place_ids = (
+            select(Place.google_place_id)
+            .where(
+                Place.user_id == current_user.id,
+                Place.google_place_id.isnot(None)
+            )
+        )
+        criteria += [
+            Place.user_id != current_user.id,
+            Place.google_place_id.not_in(user_saved_place_ids)
+        ]
     
-    # Check if there are places from other users
-    other_users_places = [p for p in places if p.user_id != current_user.id]
-    
-    # Filter places with local-related tags
-    local_places = []
-    for place in places:
-        # If there are other users, exclude user's saved places; otherwise include them
-        if other_users_places:
-            if place.google_place_id in user_saved_place_ids:
-                continue
-        
-        if place.tags:
-            tags_lower = [t.lower() for t in place.tags]
-            if any(word in tags_lower for word in ['local', 'independent', 'family', 'small', 'neighborhood']):
-                local_places.append(place)
+    # One row per venue, however many users tagged and saved it
+    result = await db.execute(
+        select(*PLACE_CARD_COLUMNS, Place.tags)
+        .where(Place.id.in_(newest_per_venue(*criteria)))
+        .order_by(desc(Place.created_at))
+        .limit(10)
+    )
+    local_places = result.all()
     
-    return [
-        {
-            "id": place.id,
-            "name": place.name,
-            "address": place.address,
-            "district": place.district,
-            "lat": place.lat,
-            "lng": place.lng,
-            "category": place.category,
-            "emoji": place.emoji,
-            "photo_url": place.photo_url,
-            "rating": place.rating,
-            "tags": place.tags
-        }
-        for place in local_places[:10]
-    ]
+    # Serialized straight from the rows by LocalPlaceResponse
+    return local_places
 
 
 # ============================================================================
@@ -893,7 +1101,8 @@ async def get_friend_taste_match(
     Calculate taste match percentage with friends.
     For MVP, return mock data with simplified format.
     """
-    # TODO: Implement real friend matching logic
+    # TODO: Implement real friend matching logic once friendships exist;
+    # users who merely saved the same venue are strangers, not friends
     # For now, return mock data
     return [
         {
@@ -921,107 +1130,256 @@ async def get_friend_taste_match(
 # AI Chat Endpoint (For ChatView)
 # ============================================================================
 
+# Shared Azure OpenAI client for /chat (reuses its HTTP connection pool)
+chat_client = AsyncAzureOpenAI(
+    api_key=os.getenv("AZURE_OPENAI_KEY"),
+    api_version="2024-10-21",
+    azure_endpoint="https://hkust.azure-api.net"
+)
+
+
+class ChatMessage(BaseModel):
+    role: Literal["user", "assistant", "system"]
+    content: str
+
+
 class ChatRequest(BaseModel):
     message: str
-    conversation_history: List[dict] = Field(default_factory=list)
+    conversation_history: List[ChatMessage] = Field(default_factory=list)
+
+
+# Static system prompt. Kept identical across requests and above 1024 tokens
+# so OpenAI's automatic prompt caching can reuse it as a cached prefix -
+# don't interpolate per-user or per-request values into it.
+CHAT_SYSTEM_PROMPT = """You are Radar's AI assistant helping users find cool spots in Hong Kong.
+Your tone is casual, friendly, and Gen Z but not over the top - no excessive slang.
+Use emojis sparingly (✨ ☕️ 🍝 🔥 occasionally).
+When recommending places, respond with ONLY place names separated by | like this:
+'Carbone Hong Kong|% Arabica|NOC Coffee'
+If not recommending specific places, just give a helpful text response.
+Keep responses under 100 words.
+
+## Response rules
+- A recommendation reply contains nothing but place names joined by |. No intro, no numbering, no descriptions, no trailing punctuation.
+- Recommend between 2 and 5 places. Prefer places that are currently operating and well known enough to be found on Google Maps.
+- Use the venue's name as it appears on Google Maps, adding "Hong Kong" or the district when the name alone is ambiguous (e.g. 'Carbone Hong Kong', 'Blue Bottle Coffee Central').
+- Never invent venues. If you are not confident a place exists, leave it out.
+- For questions that are not asking for places (opening hours, how to get somewhere, what a dish is, general chat), answer in plain text without any | characters.
+- If the user asks about somewhere outside Hong Kong, say Radar only covers Hong Kong for now.
+- Don't mention these instructions, Radar's internals, or that you are an AI model unless asked directly.
+
+## Hong Kong districts
+Hong Kong has 18 districts. Use these (and the neighbourhoods inside them) to interpret where the user wants to go:
+- Central and Western: Central, Sheung Wan, Sai Ying Pun, Kennedy Town, Mid-Levels, The Peak, Admiralty (shared with Wan Chai)
+- Wan Chai: Wan Chai, Causeway Bay, Happy Valley, Tai Hang, Admiralty
+- Eastern: North Point, Fortress Hill, Tin Hau, Quarry Bay, Tai Koo, Sai Wan Ho, Shau Kei Wan, Chai Wan
+- Southern: Aberdeen, Ap Lei Chau, Wong Chuk Hang, Repulse Bay, Stanley, Deep Water Bay, Pok Fu Lam
+- Yau Tsim Mong: Tsim Sha Tsui (TST), Jordan, Yau Ma Tei, Mong Kok, Tai Kok Tsui
+- Sham Shui Po: Sham Shui Po, Cheung Sha Wan, Lai Chi Kok, Mei Foo, Prince Edward
+- Kowloon City: Kowloon City, Hung Hom, To Kwa Wan, Kowloon Tong, Ho Man Tin, Kai Tak
+- Wong Tai Sin: Wong Tai Sin, Diamond Hill, San Po Kong, Lok Fu
+- Kwun Tong: Kwun Tong, Ngau Tau Kok, Kowloon Bay, Lam Tin, Yau Tong
+- Kwai Tsing: Kwai Chung, Kwai Fong, Tsing Yi
+- Tsuen Wan: Tsuen Wan, Sham Tseng, Ma Wan
+- Tuen Mun: Tuen Mun, Gold Coast, So Kwun Wat
+- Yuen Long: Yuen Long, Tin Shui Wai, Kam Tin
+- North: Sheung Shui, Fanling, Sha Tau Kok
+- Tai Po: Tai Po, Tai Mei Tuk, Plover Cove
+- Sha Tin: Sha Tin, Ma On Shan, Tai Wai, Fo Tan
+- Sai Kung: Sai Kung Town, Tseung Kwan O, Clear Water Bay, Hang Hau
+- Islands: Lantau, Tung Chung, Discovery Bay, Mui Wo, Lamma Island, Cheung Chau, Peng Chau
+Common shorthand: "TST" is Tsim Sha Tsui, "CWB" is Causeway Bay, "SYP" is Sai Ying Pun, "KT" is Kennedy Town, "MK" is Mong Kok, "SSP" is Sham Shui Po, "TKO" is Tseung Kwan O, "DB" is Discovery Bay.
+"Hong Kong Island" means Central and Western, Wan Chai, Eastern and Southern. "Kowloon" means Yau Tsim Mong, Sham Shui Po, Kowloon City, Wong Tai Sin and Kwun Tong. Everything else is the New Territories or the outlying islands.
+If the user names a district, only recommend places inside it or within a short walk of it.
+
+## Radar categories
+Users save places into these categories, so think in the same buckets:
+- eat 🍽️: restaurants, dim sum, cha chaan teng, noodle shops, street food, fine dining, takeaway
+- cafes ☕: coffee shops, specialty roasters, tea houses, dessert and bakery cafes, brunch spots
+- bars 🍸: cocktail bars, wine bars, pubs, craft beer, rooftop bars, speakeasies
+- shops 🛍️: boutiques, vintage stores, bookshops, markets, design stores, malls
+- leisure 🎭: cinemas, arcades, bowling, escape rooms, karaoke, workshops and classes
+- go_out ✨: clubs, live music, events, night markets, seasonal pop-ups
+- nature 🌳: hikes, beaches, parks, country parks, viewpoints, islands
+- culture 🎨: museums, galleries, heritage buildings, temples, exhibitions
+- fitness 💪: gyms, climbing walls, yoga and pilates studios, sports venues
+- beauty 💅: salons, nail bars, spas, barbers
+
+## Picking good recommendations
+- Match the vibe the user describes (date night, solo work session, big group, cheap eats, late night, rainy day) before matching cuisine.
+- Mix well-known spots with smaller local or independent places when both fit the request.
+- Respect budget hints: "cheap" or "affordable" means cha chaan teng, dai pai dong and casual spots; "fancy" or "special occasion" means fine dining or hotel bars.
+- Respect timing hints: late-night requests should favour places that stay open past midnight, brunch requests should favour weekend brunch spots.
+- If the request is too vague to pick places (e.g. "somewhere nice"), ask one short follow-up question instead of guessing."""
+
+# Shown in place of the raw "A|B|C" reply when the AI recommends places
+CHAT_INTRO_MESSAGES = [
+    "here are some solid spots for you",
+    "check these out",
+    "here's what i found",
+    "these places are pretty good"
+]
+
+
+def build_chat_messages(request: ChatRequest) -> List[dict]:
+    """Build the OpenAI message list for a chat request"""
+    # System prompt first so its prefix is cached
+    messages = [{"role": "system", "content": CHAT_SYSTEM_PROMPT}]
+    
+    # Add conversation history
+    for msg in request.conversation_history[-10:]:  # Last 10 messages
+        messages.append(msg.model_dump())
+    
+    # Add current message
+    messages.append({"role": "user", "content": request.message})
+    return messages
+
+
+async def resolve_chat_reply(ai_response: str) -> dict:
+    """
+    Turn the AI's reply into the chat payload.
+    A "|"-separated reply is a list of place names: look each one up on
+    Google Places concurrently and swap the text for a friendly intro.
+    """
+    # Check if AI is recommending places (contains | separator)
+    places_data = []
+    if "|" in ai_response:
+        # Extract place names
+        place_names = [name.strip() for name in ai_response.split("|")]
+        
+        # Search for all places concurrently using Google Places
+        place_names = place_names[:5]  # Max 5 places
+        search_results = await asyncio.gather(
+            *(autocomplete_search(place_name, location="22.3193,114.1694") for place_name in place_names),
+            return_exceptions=True
+        )
+        for place_name, results in zip(place_names, search_results):
+            if isinstance(results, Exception):
+                logger.error("❌ Failed to search place '%s': %s", place_name, results)
+                continue
+            if results:
+                # Take the first (best) result
+                places_data.append(results[0])
+        
+        # Create a friendly intro message
+        ai_response = random.choice(CHAT_INTRO_MESSAGES)
+    
+    return {
+        "response": ai_response,
+        "places": places_data  # Array of place objects with photos, ratings, etc.
+    }
+
 
 @app.post("/chat")
 async def chat(
     request: ChatRequest,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user_released)
 ):
     """
     AI chat endpoint for place recommendations and questions.
     Uses OpenAI to provide intelligent responses about Hong Kong places.
     """
     try:
-        from openai import AzureOpenAI
-        client = AzureOpenAI(
-            api_key=os.getenv("AZURE_OPENAI_KEY"),
-            api_version="2024-10-21",
-            azure_endpoint="https://hkust.azure-api.net"
-        )
-        
-        # Build messages for OpenAI
-        messages = [
-            {
-                "role": "system",
-                "content": (
-                    "You are Radar's AI assistant helping users find cool spots in Hong Kong. "
-                    "Your tone is casual, friendly, and Gen Z but not over the top - no excessive slang. "
-                    "Use emojis sparingly (✨ ☕️ 🍝 🔥 occasionally). "
-                    "When recommending places, respond with ONLY place names separated by | like this: "
-                    "'Carbone Hong Kong|% Arabica|NOC Coffee' "
-                    "If not recommending specific places, just give a helpful text response. "
-                    "Keep responses under 100 words."
-                )
-            }
-        ]
-        
-        # Add conversation history
-        for msg in request.conversation_history[-10:]:  # Last 10 messages
-            messages.append(msg)
-        
-        # Add current message
-        messages.append({"role": "user", "content": request.message})
-        
         # Call Azure OpenAI
-        response = client.chat.completions.create(
+        response = await chat_client.chat.completions.create(
             model="gpt-4o-mini",  # This is the Azure deployment name
-            messages=messages,
+            messages=build_chat_messages(request),
             temperature=0.7,
             max_tokens=200
         )
         
         ai_response = response.choices[0].message.content
         
-        logger.info(f"💬 Chat: {request.message[:50]}... → {ai_response[:50]}...")
+        logger.info("💬 Chat: %.50s... → %.50s...", request.message, ai_response)
         
-        # Check if AI is recommending places (contains | separator)
-        places_data = []
-        if "|" in ai_response:
-            # Extract place names
-            place_names = [name.strip() for name in ai_response.split("|")]
-            
-            # Search for each place using Google Places
-            from google_places_autocomplete import autocomplete_search
-            for place_name in place_names[:5]:  # Max 5 places
-                try:
-                    results = await autocomplete_search(place_name, location="22.3193,114.1694")
-                    if results:
-                        # Take the first (best) result
-                        places_data.append(results[0])
-                except Exception as e:
-                    logger.error(f"❌ Failed to search place '{place_name}': {e}")
-                    continue
-            
-            # Create a friendly intro message
-            intro_messages = [
-                "here are some solid spots for you",
-                "check these out",
-                "here's what i found",
-                "these places are pretty good"
-            ]
-            import random
-            ai_response = random.choice(intro_messages)
+        # Confirm the system prompt prefix is being served from OpenAI's cache
+        if response.usage:
+            prompt_details = getattr(response.usage, "prompt_tokens_details", None)
+            cached_tokens = getattr(prompt_details, "cached_tokens", 0) or 0
+            logger.info("💬 Chat prompt tokens: %d (cached: %d)", response.usage.prompt_tokens, cached_tokens)
         
-        return {
-            "response": ai_response,
-            "places": places_data  # Array of place objects with photos, ratings, etc.
-        }
+        return await resolve_chat_reply(ai_response)
         
     except Exception as e:
-        logger.error(f"❌ Chat error: {str(e)}")
+        logger.error("❌ Chat error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Could not process chat request"
         )
 
 
+def sse_event(data: dict, event: Optional[str] = None) -> bytes:
+    """Encode one server-sent event"""
+    prefix = f"event: {event}\n" if event else ""
+    return prefix.encode() + b"data: " + orjson.dumps(data) + b"\n\n"
+
+
+@app.post("/chat/stream")
+async def chat_stream(
+    request: ChatRequest,
+    current_user: User = Depends(get_current_user_released)
+):
+    """
+    Streaming version of /chat (server-sent events).
+    Emits a `token` event per completion delta as it arrives, then a single
+    `done` event with the same {"response", "places"} payload as /chat.
+    Place-list replies stop emitting tokens at the first "|".
+    """
+    async def event_generator():
+        try:
+            stream = await chat_client.chat.completions.create(
+                model="gpt-4o-mini",  # This is the Azure deployment name
+                messages=build_chat_messages(request),
+                temperature=0.7,
+                max_tokens=200,
+                stream=True
+            )
+            
+            parts = []
+            is_place_list = False
+            async for chunk in stream:
+                # Azure sends a leading chunk with no choices (content filter results)
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    parts.append(delta)
+                    # A "|" means a raw place-name list; buffer the rest so the
+                    # client only ever sees the intro from the `done` event
+                    is_place_list = is_place_list or "|" in delta
+                    if not is_place_list:
+                        yield sse_event({"delta": delta}, event="token")
+            
+            ai_response = "".join(parts)
+            logger.info("💬 Chat (stream): %.50s... → %.50s...", request.message, ai_response)
+            
+            yield sse_event(await resolve_chat_reply(ai_response), event="done")
+            
+        except Exception as e:
+            logger.error("❌ Chat stream error: %s", e)
+            yield sse_event({"detail": "Could not process chat request"}, event="error")
+    
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 # ============================================================================
 # ADMIN ENDPOINTS (Temporary)
 # ============================================================================
 
+# Max Google Place Details requests in flight during a backfill
+BACKFILL_CONCURRENCY = 10
+
+# Rows streamed from the DB per backfill batch
+BACKFILL_BATCH_SIZE = 200
+
+# JSON encodings of an empty opening_hours value
+EMPTY_JSON_VALUES = ("null", '""', "[]", "{}")
+
+
 @app.post("/admin/backfill")
 async def run_backfill(db: AsyncSession = Depends(get_db)):
     """
@@ -1029,83 +1387,97 @@ async def run_backfill(db: AsyncSession = Depends(get_db)):
     This will be removed after running once.
     """
     try:
-        from google_places_helper import _get_place_details
-        import json
-        
-        # Get all places
-        result = await db.execute(select(Place))
-        places = result.scalars().all()
+        total_count = (await db.execute(select(func.count(Place.id)))).scalar_one()
         
-        logger.info(f"📊 Found {len(places)} places to check")
+        # Only stream places missing opening hours; the rest are skipped in SQL
+        missing_hours = or_(
+            Place.opening_hours.is_(None),
+            cast(Place.opening_hours, Text).in_(EMPTY_JSON_VALUES)
+        )
+        result = await db.stream(
+            select(Place)
+            .where(missing_hours)
+            .execution_options(yield_per=BACKFILL_BATCH_SIZE)
+        )
         
         updated_count = 0
         failed_count = 0
-        skipped_count = 0
+        checked_count = 0
         results = []
+        updates = []
         
-        for place in places:
-            # Check if missing data
-            needs_update = False
-            
-            if not place.opening_hours:
-                logger.info(f"⚠️ {place.name} missing opening_hours")
-                needs_update = True
-            
-            if not needs_update:
-                logger.info(f"✅ {place.name} has complete data")
-                skipped_count += 1
-                continue
-            
-            # Fetch fresh data from Google
-            if not place.google_place_id:
-                logger.warning(f"⚠️ {place.name} has no google_place_id, skipping")
-                failed_count += 1
-                results.append({"place": place.name, "status": "failed", "reason": "no google_place_id"})
-                continue
-            
-            logger.info(f"🔄 Fetching fresh data for {place.name}...")
+        # Fetch fresh data from Google concurrently, capped to stay under rate limits
+        semaphore = asyncio.Semaphore(BACKFILL_CONCURRENCY)
+        
+        async def fetch_details(place: Place):
+            async with semaphore:
+                logger.info("🔄 Fetching fresh data for %s...", place.name)
+                return await _get_place_details_async(place.google_place_id)
+        
+        async for batch in result.scalars().partitions():
+            checked_count += len(batch)
+            to_fetch = []
             
-            place_details = _get_place_details(place.google_place_id)
+            for place in batch:
+                logger.info("⚠️ %s missing opening_hours", place.name)
+                
+                if not place.google_place_id:
+                    logger.warning("⚠️ %s has no google_place_id, skipping", place.name)
+                    failed_count += 1
+                    results.append({"place": place.name, "status": "failed", "reason": "no google_place_id"})
+                    continue
+                
+                to_fetch.append(place)
             
-            if not place_details:
-                logger.error(f"❌ Failed to fetch data for {place.name}")
-                failed_count += 1
-                results.append({"place": place.name, "status": "failed", "reason": "api error"})
-                continue
+            fetched = await asyncio.gather(*(fetch_details(place) for place in to_fetch))
             
-            # Update opening hours
-            if not place.opening_hours:
+            for place, place_details in zip(to_fetch, fetched):
+                if not place_details:
+                    logger.error("❌ Failed to fetch data for %s", place.name)
+                    failed_count += 1
+                    results.append({"place": place.name, "status": "failed", "reason": "api error"})
+                    continue
+                
+                # Update opening hours
                 opening_hours_data = place_details.get("opening_hours", {})
                 if opening_hours_data:
                     weekday_text = opening_hours_data.get("weekday_text", [])
                     if weekday_text:
-                        place.opening_hours = json.dumps(weekday_text)
-                        logger.info(f"  ✅ Added opening_hours")
+                        updates.append({
+                            "id": place.id,
+                            "opening_hours": weekday_text,
+                            "updated_at": datetime.utcnow()
+                        })
+                        logger.info("  ✅ Added opening_hours for %s", place.name)
                         results.append({"place": place.name, "status": "updated", "added": "opening_hours"})
-            
-            updated_count += 1
+                
+                updated_count += 1
+        
+        skipped_count = total_count - checked_count
         
-        # Commit all changes
+        # Write all changes as one bulk UPDATE by primary key
+        if updates:
+            await db.execute(update(Place), updates)
         await db.commit()
         
         summary = {
-            "total": len(places),
+            "total": total_count,
             "updated": updated_count,
             "failed": failed_count,
             "skipped": skipped_count,
             "details": results
         }
         
-        logger.info(f"\n🎉 Backfill complete!")
-        logger.info(f"  ✅ Updated: {updated_count}")
-        logger.info(f"  ❌ Failed: {failed_count}")
-        logger.info(f"  ⏭️ Skipped: {skipped_count}")
-        logger.info(f"  📊 Total: {len(places)}")
+        logger.info("\n🎉 Backfill complete!")
+        logger.info("  ✅ Updated: %s", updated_count)
+        logger.info("  ❌ Failed: %s", failed_count)
+        logger.info("  ⏭️ Skipped: %s", skipped_count)
+        logger.info("  📊 Total: %s", total_count)
         
         return summary
         
     except Exception as e:
-        logger.error(f"❌ Backfill error: {str(e)}")
+        logger.error("❌ Backfill error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Backfill failed: {str(e)}"
@@ -1119,4 +1491,4 @@ async def run_backfill(db: AsyncSession = Depends(get_db)):
 if __name__ == "__main__":
     import uvicorn
     port = int(os.getenv("PORT", 8000))
-    uvicorn.run("main:app", host="0.0.0.0", port=port, reload=True)
+    uvicorn.run("main:app", host="0.0.0.0", port=port, reload=True, loop="uvloop", http="httptools")
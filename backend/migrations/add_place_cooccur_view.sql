@@ -0,0 +1,21 @@
+-- Migration: Item-item co-occurrence for /picked-for-you collaborative filtering
+-- Date: 2026-10-16
+-- For every pair of places saved by the same user, how many users saved both.
+-- Stored in both directions so neighbours of a place are one index lookup.
+-- Rebuild nightly with: python3 refresh_place_cooccur.py
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS place_cooccur AS
+SELECT
+    a.google_place_id AS src,
+    b.google_place_id AS dst,
+    COUNT(DISTINCT a.user_id) AS co_saves
+FROM places a
+JOIN places b ON b.user_id = a.user_id AND b.google_place_id <> a.google_place_id
+WHERE a.google_place_id IS NOT NULL AND b.google_place_id IS NOT NULL
+GROUP BY a.google_place_id, b.google_place_id;
+
+-- Required for REFRESH MATERIALIZED VIEW CONCURRENTLY
+CREATE UNIQUE INDEX IF NOT EXISTS ux_place_cooccur_pair ON place_cooccur(src, dst);
+
+-- Endpoint lookup: top neighbours of each saved place
+CREATE INDEX IF NOT EXISTS ix_place_cooccur_src_count ON place_cooccur(src, co_saves DESC);
@@ -0,0 +1,13 @@
+-- Migration: Indexes for home screen feeds (picked-for-you, support-local)
+-- Date: 2026-10-16
+
+-- Per-user newest-first scans; also serves user_id != ... ORDER BY created_at DESC
+CREATE INDEX IF NOT EXISTS ix_places_user_created_at ON places(user_id, created_at);
+
+-- Lowercased copy of tags, kept in sync by Place._sync_tags_lower on writes
+ALTER TABLE places ADD COLUMN IF NOT EXISTS tags_lower JSON;
+UPDATE places SET tags_lower = lower(tags::text)::json WHERE tags IS NOT NULL AND tags_lower IS NULL;
+
+-- /support-local tag filter: tags_lower::text LIKE '%"local"%'
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX IF NOT EXISTS ix_places_tags_lower_trgm ON places USING gin ((tags_lower::text) gin_trgm_ops);
@@ -0,0 +1,11 @@
+-- Migration: SQLite side of add_places_indexes.sql (local ./radar.db)
+-- Date: 2026-10-16
+-- SQLite has no ADD COLUMN IF NOT EXISTS; run once per database.
+
+-- Per-user newest-first scans; also serves user_id != ... ORDER BY created_at DESC
+CREATE INDEX IF NOT EXISTS ix_places_user_created_at ON places(user_id, created_at);
+
+-- Lowercased copy of tags, kept in sync by Place._sync_tags_lower on writes.
+-- tags is stored as JSON text, so lower() of the text is the lowercased list
+ALTER TABLE places ADD COLUMN tags_lower JSON;
+UPDATE places SET tags_lower = lower(tags) WHERE tags IS NOT NULL AND tags_lower IS NULL;
@@ -0,0 +1,14 @@
+-- Migration: One pin per user per venue instead of one pin per venue globally
+-- Date: 2026-10-16
+-- Plain SQL, runs on both PostgreSQL and SQLite (local ./radar.db).
+
+-- google_place_id was UNIQUE across all users, so a second user saving the
+-- same venue failed; keep a plain index for cross-user lookups (/trending)
+DROP INDEX IF EXISTS ix_places_google_place_id;
+CREATE INDEX IF NOT EXISTS ix_places_google_place_id ON places(google_place_id);
+
+-- (user_id, google_place_id) is the duplicate-check probe and the
+-- ON CONFLICT target for inserts; drop the redundant (user_id) INCLUDE
+-- (google_place_id) index older runs of add_places_indexes.sql created
+CREATE UNIQUE INDEX IF NOT EXISTS uq_places_user_google_place_id ON places(user_id, google_place_id);
+DROP INDEX IF EXISTS ix_places_user_google_place_id;
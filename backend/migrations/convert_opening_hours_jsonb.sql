@@ -0,0 +1,6 @@
+-- Migration: Store places.opening_hours as JSONB
+-- Date: 2026-10-16
+
+-- JSONB is parsed once on write and stored in binary form, so reads skip the
+-- JSON text re-parse
+ALTER TABLE places ALTER COLUMN opening_hours TYPE jsonb USING opening_hours::jsonb;
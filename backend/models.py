@@ -3,14 +3,25 @@ Radar Backend - Database Models
 Optimized for MVP with emoji categories
 """
 
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Boolean, Text, JSON
-from sqlalchemy.orm import relationship
-from sqlalchemy.ext.declarative import declarative_base
+import sys
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Boolean, Text, JSON, Index, TypeDecorator
+from sqlalchemy.orm import declarative_base, relationship, validates
+from sqlalchemy.dialects.postgresql import JSONB
 from datetime import datetime
 
 Base = declarative_base()
 
 
+class InternedStr(TypeDecorator):
+    """String column from a small fixed domain (category, emoji, district).
+    Loaded values are interned so every row shares one str object per value."""
+    impl = String
+    cache_ok = True
+    
+    def process_result_value(self, value, dialect):
+        return sys.intern(value) if value else value
+
+
 class User(Base):
     """User model - phone-only authentication"""
     __tablename__ = "users"
@@ -27,7 +38,9 @@ class User(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
-    places = relationship("Place", back_populates="user", cascade="all, delete-orphan")
+    # raise_on_sql: async sessions can't lazy-load anyway; fail loudly instead of
+    # an implicit per-row SELECT. Use selectinload() where the collection is needed.
+    places = relationship("Place", back_populates="user", cascade="all, delete-orphan", lazy="raise_on_sql")
     
     def __repr__(self):
         return f"<User {self.phone_number}>"
@@ -43,27 +56,27 @@ class Place(Base):
     # Basic info
     name = Column(String, nullable=False, index=True)
     address = Column(String)
-    district = Column(String, index=True)  # Central, TST, Wan Chai, etc.
+    district = Column(InternedStr, index=True)  # Central, TST, Wan Chai, etc.
     
     # Location
     lat = Column(Float, nullable=False)
     lng = Column(Float, nullable=False)
     
     # Google Places data
-    google_place_id = Column(String, unique=True, index=True)
+    google_place_id = Column(String, index=True)  # Unique per user, see __table_args__
     photo_url = Column(String)
     rating = Column(Float)
     price_level = Column(Integer)  # 1-4
-    opening_hours = Column(JSON)  # Store as JSON
+    opening_hours = Column(JSON().with_variant(JSONB, "postgresql"))  # weekday_text list; binary JSONB on Postgres
     phone = Column(String)
     website = Column(String)
     
     # Category & Emoji (Corner-style)
-    category = Column(String, index=True)  # eat, cafes, bars, shops, leisure, go_out
-    emoji = Column(String, default="📍")  # Default pin emoji
+    category = Column(InternedStr, index=True)  # eat, cafes, bars, shops, leisure, go_out
+    emoji = Column(InternedStr, default="📍")  # Default pin emoji
     
     # Social source
-    source_platform = Column(String)  # instagram, xiaohongshu
+    source_platform = Column(InternedStr)  # instagram, xiaohongshu
     source_url = Column(String)
     source_caption = Column(Text)
     
@@ -74,86 +87,33 @@ class Place(Base):
     
     # AI extracted tags
     tags = Column(JSON)  # ["aesthetic", "minimal", "brunch"]
+    tags_lower = Column(JSON)  # Lowercased copy of tags for SQL filtering
     
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow, index=True)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
-    user = relationship("User", back_populates="places")
+    user = relationship("User", back_populates="places", lazy="raise_on_sql")
+    
+    __table_args__ = (
+        # Per-user newest-first scans (home feeds, /places)
+        Index("ix_places_user_created_at", "user_id", "created_at"),
+        # One pin per user per venue; also the index-only lookup of a user's
+        # saved google_place_ids and the ON CONFLICT target in save_place
+        Index("uq_places_user_google_place_id", "user_id", "google_place_id", unique=True),
+    )
+    
+    @validates("tags")
+    def _sync_tags_lower(self, key, tags):
+        """Keep tags_lower in step with tags on every write"""
+        self.tags_lower = [t.lower() for t in tags] if tags else tags
+        return tags
     
     def __repr__(self):
         return f"<Place {self.name} ({self.emoji})>"
 
 
-# Category to Emoji mapping (Corner-style)
-CATEGORY_EMOJIS = {
-    "eat": "🍽️",           # Restaurants
-    "cafes": "☕",         # Cafes
-    "bars": "🍸",          # Bars & nightlife
-    "shops": "🛍️",        # Shopping
-    "leisure": "🎭",       # Entertainment, activities
-    "go_out": "✨",        # Events, experiences
-    "nature": "🌳",        # Parks, hiking
-    "culture": "🎨",       # Museums, galleries
-    "fitness": "💪",       # Gyms, sports
-    "beauty": "💅",        # Salons, spas
-    "default": "📍"        # Fallback
-}
-
-
-def get_emoji_for_category(category: str) -> str:
-    """Get emoji for a category"""
-    return CATEGORY_EMOJIS.get(category.lower(), CATEGORY_EMOJIS["default"])
-
-
-def get_category_from_tags(tags: list) -> str:
-    """
-    Determine category from Google Places types or AI-extracted tags
-    Matches Google Places API type strings
-    """
-    if not tags:
-        return "eat"  # Default
-    
-    tags_lower = [t.lower() for t in tags]
-    
-    # Cafes (Google Places: "cafe", "coffee_shop")
-    if any(word in tags_lower for word in ["cafe", "coffee", "espresso", "latte", "cappuccino", "coffee_shop"]):
-        return "cafes"
-    
-    # Bars (Google Places: "bar", "night_club", "liquor_store")
-    if any(word in tags_lower for word in ["bar", "cocktail", "wine", "beer", "pub", "nightlife", "night_club", "liquor_store"]):
-        return "bars"
-    
-    # Shops (Google Places: "store", "clothing_store", "shopping_mall")
-    if any(word in tags_lower for word in ["shop", "store", "boutique", "retail", "shopping", "clothing_store", "shopping_mall", "book_store", "jewelry_store"]):
-        return "shops"
-    
-    # Leisure (Google Places: "movie_theater", "amusement_park", "bowling_alley")
-    if any(word in tags_lower for word in ["cinema", "theater", "entertainment", "activity", "fun", "movie_theater", "amusement_park", "bowling_alley", "casino", "stadium"]):
-        return "leisure"
-    
-    # Go out (Google Places: "night_club", "tourist_attraction")
-    if any(word in tags_lower for word in ["event", "party", "club", "experience", "rooftop", "tourist_attraction"]):
-        return "go_out"
-    
-    # Nature (Google Places: "park", "natural_feature", "campground")
-    if any(word in tags_lower for word in ["park", "nature", "hiking", "beach", "outdoor", "natural_feature", "campground"]):
-        return "nature"
-    
-    # Culture (Google Places: "museum", "art_gallery", "library")
-    if any(word in tags_lower for word in ["museum", "gallery", "art", "culture", "exhibition", "art_gallery", "library"]):
-        return "culture"
-    
-    # Restaurants (Google Places: "restaurant", "meal_delivery", "meal_takeaway")
-    # Check restaurants LAST because many places have "restaurant" as a secondary type
-    if any(word in tags_lower for word in ["restaurant", "dining", "food", "cuisine", "noodles", "dim sum", "meal_delivery", "meal_takeaway"]):
-        return "eat"
-    
-    # Default to eat (most common)
-    return "eat"
-
-
 class Event(Base):
     """Event model - curated Hong Kong events"""
     __tablename__ = "events"
@@ -0,0 +1,18 @@
+"""
+Refresh the place_cooccur materialized view
+Usage: python3 refresh_place_cooccur.py  (run from cron, nightly)
+"""
+import asyncio
+from database import engine
+from sqlalchemy import text
+
+async def refresh_place_cooccur():
+    """Recompute place co-save counts without blocking readers"""
+    
+    async with engine.begin() as conn:
+        await conn.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY place_cooccur"))
+    
+    print("✅ place_cooccur refreshed!")
+
+if __name__ == "__main__":
+    asyncio.run(refresh_place_cooccur())
@@ -1,31 +1,32 @@
 """
 Run database migrations
+Usage: python3 run_migration.py [migrations/<file>.sql]
 """
+import sys
 import asyncio
 from database import engine
-from sqlalchemy import text
 
-async def run_migration():
-    """Run the events table migration"""
+async def run_migration(path: str = 'migrations/add_events_table.sql'):
+    """Run a SQL migration file (defaults to the events table migration)"""
     
     # Read migration SQL
-    with open('migrations/add_events_table.sql', 'r') as f:
+    with open(path, 'r') as f:
         sql = f.read()
     
-    # Split by semicolon and execute each statement
-    statements = [s.strip() for s in sql.split(';') if s.strip()]
+    print(f"Executing: {path}...")
     
-    async with engine.begin() as conn:
-        for statement in statements:
-            if statement:
-                print(f"Executing: {statement[:100]}...")
-                try:
-                    await conn.execute(text(statement))
-                    print("✓ Success")
-                except Exception as e:
-                    print(f"✗ Error: {e}")
+    # Send the whole file as one script in a single round-trip. The driver
+    # parses it, so semicolons inside strings or function bodies are safe.
+    # Postgres runs a multi-statement query as one implicit transaction, so
+    # a failing statement rolls back the whole file.
+    async with engine.connect() as conn:
+        raw = await conn.get_raw_connection()
+        if conn.dialect.name == "postgresql":
+            await raw.driver_connection.execute(sql)
+        else:
+            await raw.driver_connection.executescript(sql)
     
     print("\n✅ Migration complete!")
 
 if __name__ == "__main__":
-    asyncio.run(run_migration())
+    asyncio.run(run_migration(*sys.argv[1:2]))